@@ -26,7 +26,7 @@ def test_algoritm(shapes):
     src = np.arange(size, dtype=np.int32).reshape(SHAPE)
     ITEMSIZE = src.dtype.itemsize
 
-    src_part, indexation = td.tData(src, PART_SHAPE, inverse=False)
+    src_part, nparts = td.tData(src, PART_SHAPE, inverse=False)
     TSHAPE = src_part.shape
 
     KB = 1024
@@ -46,7 +46,53 @@ def test_algoritm(shapes):
     res = td.decompress(schunk, ITEMSIZE, SHAPE, b=15)
 
     schunk_t = td.compress_trans(cparams, dparams, src_part, TSHAPE, PART_SHAPE)
-    res2 = td.decompress_trans(schunk_t, indexation, ITEMSIZE, SHAPE, TSHAPE, PART_SHAPE,
+    res2 = td.decompress_trans(schunk_t, ITEMSIZE, SHAPE, TSHAPE, PART_SHAPE,
                                b=15)
 
     np.testing.assert_array_equal(res, res2)
+    np.testing.assert_array_equal(src[:, 15], res2.reshape(src[:, 15].shape))
+
+    # Several fixed indices (only the partitions that contain them are decompressed)
+
+    res3 = td.decompress_trans(schunk_t, ITEMSIZE, SHAPE, TSHAPE, PART_SHAPE,
+                               a=SHAPE[0] - 1, c=7)
+
+    np.testing.assert_array_equal(src[-1, :, 7], res3.reshape(src[-1, :, 7].shape))
+
+
+def test_iter_partitions(shapes):
+    SHAPE, PART_SHAPE = shapes
+    size = np.prod(np.array(SHAPE))
+
+    src = np.arange(size, dtype=np.int32).reshape(SHAPE)
+
+    src_part, nparts = td.tData(src, PART_SHAPE, inverse=False)
+
+    parts = list(td.iter_partitions(src_part, PART_SHAPE))
+
+    assert len(parts) == src_part.size // np.prod(PART_SHAPE)
+    assert all(np.shares_memory(part, src_part) for part in parts)
+
+    np.testing.assert_array_equal(np.concatenate(parts), src_part.reshape(-1))
+
+
+def test_obtain_index(shapes):
+    SHAPE, PART_SHAPE = shapes
+
+    TSHAPE = [-(-SHAPE[i] // PART_SHAPE[i]) * PART_SHAPE[i] for i in range(len(SHAPE))]
+    nparts = [TSHAPE[i] // PART_SHAPE[i] for i in range(len(SHAPE))]
+
+    dim = [(n // 3, n - n // 4) for n in SHAPE]
+
+    origins, numbers = td.obtainIndex(dim, TSHAPE, PART_SHAPE)
+
+    expected = [(np.array(pc) * PART_SHAPE, np.ravel_multi_index(pc, nparts))
+                for pc in np.ndindex(*nparts)
+                if all(dim[i][0] < (pc[i] + 1) * PART_SHAPE[i] and pc[i] * PART_SHAPE[i] < dim[i][1]
+                       for i in range(len(SHAPE)))]
+
+    np.testing.assert_array_equal(origins, [o for o, n in expected])
+    np.testing.assert_array_equal(numbers, [n for o, n in expected])
+
+    for o, n in zip(origins, numbers):
+        assert td.partition_number(o + np.array(PART_SHAPE) - 1, TSHAPE, PART_SHAPE) == n
@@ -23,8 +23,8 @@ def tData(src, sub_shp, inverse=False):
     -------
     dest: np.array
         Data transformed.
-    d: dict
-        Dictionary with partitions indexation.
+    nparts: tuple
+        Number of partitions in each dimension (see partition_number).
     """
 
     # Obtain src parameters
@@ -58,9 +58,9 @@ def tData(src, sub_shp, inverse=False):
 
     lib.tData(src_b, dest_b, typesize, shape, pad_shp, sub_shp, size, dimension, inverse)
 
-    d = createIndexation(pad_shp, sub_shp)
+    nparts = tuple(pad_shp[i] // sub_shp[i] for i in range(dimension))
 
-    return dest, d
+    return dest, nparts
 
 
 def reorder_dim(dim, l):
@@ -78,73 +78,68 @@ def create_shape(s):
     return s_aux
 
 
-def createIndexation(shape, sub_shp):
+def partition_number(index, ts, sb):
     """
-    Create an indexation of data partitions.
+    Calculate the schunk number of the partition containing an element.
+
+    The partitions are stored in C order, so the number is the position of the partition in the
+    grid of partitions.
 
     Parameters
     ----------
-    shape : int[] or tuple
-        Data shape.
-    sub_shp: int[] or tuple
+    index : int[] or tuple
+        Element coordinates.
+    ts: int[] or tuple
+        Transformed (extended) data shape.
+    sb: int[] or tuple
         Data partition shape.
 
     Returns
     -------
-    indexation: dict
-        Dictianary containing the indexation.
-        key: partition number
-        value: schunk number to decompress
+    n: int
+        Schunk number.
     """
 
-    dimension = len(shape)
-
-    # Calculate the partitions the size
-
-    size = int(np.prod(shape)/np.prod(sub_shp))
+    n = 0
 
-    keys = np.zeros(size, dtype=np.int64)
+    for i in range(len(ts)):
+        n = n * (ts[i] // sb[i]) + index[i] // sb[i]
 
-    k_b = ffi.from_buffer(keys)
+    return n
 
-    # Create the indexation
 
-    lib.createIndexation(k_b, shape, sub_shp, dimension)
-
-    # Create a dicttionary with keys and values
-
-    d = dict([(k, v) for v, k in enumerate(keys)])
-
-    return d
+def obtainIndex(dim, ts, sb):
+    """
+    Obtain the partitions that intersect a hyper-rectangle.
 
+    Parameters
+    ----------
+    dim : list of tuples
+        Range (start, stop) of the hyper-rectangle in each dimension.
+    ts: int[] or tuple
+        Transformed (extended) data shape.
+    sb: int[] or tuple
+        Data partition shape.
 
-def obtainIndex(dim, dic, s, sb):
+    Returns
+    -------
+    origins: np.array
+        Coordinates of the first element of each partition, with shape (M, dimension).
+    numbers: np.array
+        Schunk number of each partition (in increasing order).
+    """
 
-    s = create_shape(s)
-    sb = create_shape(sb)
+    ts = np.array(ts, dtype=np.int64)
+    sb = np.array(sb, dtype=np.int64)
 
-    ind = []
+    ranges = [np.arange(dim[i][0] // sb[i], (dim[i][1] + sb[i] - 1) // sb[i]) for i in range(len(ts))]
 
-    for a in range(dim[0][0]//sb[0]*sb[0], dim[0][1], sb[0]):
-        for b in range(dim[1][0]//sb[1]*sb[1], dim[1][1], sb[1]):
-            for c in range(dim[2][0]//sb[2]*sb[2], dim[2][1], sb[2]):
-                for d in range(dim[3][0]//sb[3]*sb[3], dim[3][1], sb[3]):
-                    for e in range(dim[4][0]//sb[4]*sb[4], dim[4][1], sb[4]):
-                        for f in range(dim[5][0]//sb[5]*sb[5], dim[5][1], sb[5]):
-                            for g in range(dim[6][0]//sb[6]*sb[6], dim[6][1], sb[6]):
-                                for h in range(dim[7][0]//sb[7]*sb[7], dim[7][1], sb[7]):
+    grid = np.meshgrid(*ranges, indexing='ij')
+    pc = np.stack([g.reshape(-1) for g in grid], axis=1)
 
-                                    K = (h
-                                         + g*s[7]
-                                         + f*s[7]*s[6]
-                                         + e*s[7]*s[6]*s[5]
-                                         + d*s[7]*s[6]*s[5]*s[4]
-                                         + c*s[7]*s[6]*s[5]*s[4]*s[3]
-                                         + b*s[7]*s[6]*s[5]*s[4]*s[3]*s[2]
-                                         + a*s[7]*s[6]*s[5]*s[4]*s[3]*s[2]*s[1])
+    numbers = np.ravel_multi_index(pc.T, ts // sb) if len(pc) else np.empty(0, dtype=np.int64)
 
-                                    ind.append(((a, b, c, d, e, f, g, h), dic[K]))
-    return ind
+    return pc * sb, numbers
 
 
 # Compression/decompression functions
@@ -177,81 +172,91 @@ def decompress(schunk, item_size, s, a=slice(0, None), b=slice(0, None), c=slice
     cb2.blosc2_decompress_chunk(schunk, 0, dest, bsize)
     cb2.blosc2_free_schunk(schunk)
 
-    return dest[dim]
+    return dest[tuple(dim)]
 
 
-def compress_trans(cparams, dparams, srct, ts, sb):
+def iter_partitions(srct, sb):
+    """
+    Iterate over the partitions of transformed data without copying them.
 
-    a_size = np.prod(sb)
+    Parameters
+    ----------
+    srct : np.array
+        Data transformed (C contiguous).
+    sb: int[] or tuple
+        Data partition shape.
+
+    Yields
+    ------
+    part : np.array
+        1-D view of the next partition in the buffer of srct.
+    """
 
-    a_bsize = a_size * srct.dtype.itemsize
+    if not srct.flags.c_contiguous:
+        raise ValueError("transformed data must be C contiguous")
+
+    a_size = int(np.prod(sb))
+
+    flat = srct.reshape(-1)
+
+    for i in range(flat.size // a_size):
+        yield flat[i * a_size:(i + 1) * a_size]
+
+
+def compress_trans(cparams, dparams, srct, ts, sb):
+
+    a_bsize = int(np.prod(sb)) * srct.dtype.itemsize
 
     schunk = cb2.blosc2_new_schunk(cparams, dparams)
 
-    for i in range(np.prod([ts[j]//sb[j] for j in range(len(ts))])):
+    # Each partition is compressed with the threads of cparams
 
-        aux = srct.flatten()[i * a_size:(i+1) * a_size]
+    for aux in iter_partitions(srct, sb):
 
         nchunks = cb2.blosc2_append_buffer(schunk, a_bsize, aux)
 
     return schunk
 
 
-def decompress_trans(schunk, indexation, item_size, s, ts, sb, a=-1, b=-1, c=-1, d=-1,
-                     e=-1, f=-1, g=-1, h=-1):
+def decompress_trans(schunk, item_size, s, ts, sb, a=-1, b=-1, c=-1, d=-1, e=-1, f=-1,
+                     g=-1, h=-1):
 
     dim = reorder_dim([a, b, c, d, e, f, g, h], len(s))
 
-    s_aux = [1, 1, 1, 1, 1, 1, 1, 1]
-    ts_aux = [1, 1, 1, 1, 1, 1, 1, 1]
-    sb_aux = [1, 1, 1, 1, 1, 1, 1, 1]
-    dim_aux = [-1, -1, -1, -1, -1, -1, -1, -1]
-    for i in range(len(s)):
-        s_aux[-len(s) + i] = s[i]
-    return s_aux
-
     s = create_shape(s)
     ts = create_shape(ts)
     sb = create_shape(sb)
 
+    # Only the partitions that contain the fixed indices are decompressed (obtainIndex)
+
     index_aux = [1, 1, 1, 1, 1, 1, 1, 1]
-    ul = np.copy(ts)
-    ui = [(0, ts[0]), (0, ts[1]), (0, ts[2]), (0, ts[3]), (0, ts[4]), (0, ts[5]), (0, ts[6]),
-          (0, ts[7])]
+    ul = list(ts)
+    ui = [(0, ts[i]) for i in range(len(ts))]
 
     for i in range(len(index_aux)):
-        if dim[i] is not -1:
+        if dim[i] != -1:
             ul[i] = sb[i]
-            ui[i] = (dim[i], dim[i]+1)
+            ui[i] = (dim[i], dim[i] + 1)
             index_aux[i] = 0
             dim[i] = dim[i] % ul[i]
         else:
             dim[i] = slice(0, s[i])
 
-    subpl = ul
-
-    ind = obtainIndex(ui, indexation, ts, sb)
+    origins, numbers = obtainIndex(ui, ts, sb)
 
-    dest = np.zeros(np.prod(subpl), dtype=np.int32).reshape(subpl)
+    dest = np.zeros(np.prod(ul), dtype=np.int32).reshape(ul)
 
     aux_size = np.prod(sb)
     AUX_bsize = aux_size * item_size
 
     aux = np.zeros(aux_size, dtype=np.int32).reshape(sb)
 
-    for index, n in ind:
+    for index, n in zip(origins, numbers):
 
-        index = [index[q]*index_aux[q] for q in range(len(dim))]
+        index = [index[q] * index_aux[q] for q in range(len(dim))]
 
-        cb2.blosc2_decompress_chunk(schunk, n, aux, AUX_bsize)
+        cb2.blosc2_decompress_chunk(schunk, int(n), aux, AUX_bsize)
 
-        dest[index[0]:index[0]+sb[0],
-             index[1]:index[1]+sb[1],
-             index[2]:index[2]+sb[2],
-             index[3]:index[3]+sb[3],
-             index[4]:index[4]+sb[4],
-             index[5]:index[5]+sb[5],
-             index[6]:index[6]+sb[6],
-             index[7]:index[7]+sb[7]] = aux
+        dest[tuple(slice(index[q], index[q] + sb[q]) for q in range(len(dim)))] = aux
 
-    return dest[dim]
+    return dest[tuple(dim)]
@@ -0,0 +1,106 @@
+"""
+Microbenchmark of the transformation copy kernels.
+
+Compares the calculate_j algorithm (padData + tData_simple, one generic memcpy per row) with the
+stride-table algorithm (tData_part) on the uint8 images and on float32/float64 climate-like
+datasets. tData_part is timed with the copies specialized by typesize and row length and with
+plain memcpy calls (the library built again as tData_memcpy with PLAIN_MEMCPY defined), so the
+gain of the copy kernels is measured on its own.
+"""
+
+from cffi import FFI
+import importlib
+import importlib.util
+import transformData as td
+import matplotlib.pyplot as plt
+import numpy as np
+import time as t
+
+REPEATS = 5
+
+
+def best_time(f):
+    times = []
+    for _ in range(REPEATS):
+        start = t.perf_counter()
+        f()
+        end = t.perf_counter()
+        times.append(end - start)
+    return min(times)
+
+
+def legacy(src, ps):
+    shape = src.shape
+    ts = [shape[i] + (ps[i] - shape[i] % ps[i]) % ps[i] for i in range(len(shape))]
+
+    src_pad = np.zeros(ts, dtype=src.dtype)
+    dest = np.empty(ts, dtype=src.dtype)
+
+    td.lib.padData(td.ffi.from_buffer(src), td.ffi.from_buffer(src_pad), src.dtype.itemsize,
+                   shape, ts, len(shape))
+    td.lib.tData_simple(td.ffi.from_buffer(src_pad), td.ffi.from_buffer(dest), src.dtype.itemsize,
+                        ps, ts, len(shape), 0)
+    return dest
+
+
+def build_memcpy():
+    """
+    Build and import tData_memcpy, the tData library with a plain memcpy per row.
+    """
+
+    # The builder is loaded from its file (import tData returns the compiled library)
+
+    spec = importlib.util.spec_from_file_location("tData_builder", "tData.py")
+    builder = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(builder)
+
+    ffibuilder = FFI()
+    ffibuilder.set_source("tData_memcpy", builder.SOURCE, libraries=builder.LIBRARIES,
+                          define_macros=[('PLAIN_MEMCPY', None)])
+    ffibuilder.cdef(builder.CDEF)
+    ffibuilder.compile()
+
+    return importlib.import_module("tData_memcpy")
+
+
+memcpy = build_memcpy()
+
+
+def plain_memcpy(src, ps):
+    plan = td.get_plan(src.shape, ps, src.dtype)
+    dest = np.empty(plan.trans_shape, dtype=src.dtype)
+
+    memcpy.lib.tData_part(memcpy.ffi.from_buffer(src), memcpy.ffi.from_buffer(dest), plan.typesize,
+                          list(plan.shape), memcpy.ffi.NULL, list(plan.part_shape), plan.dimension, 0,
+                          memcpy.ffi.NULL, 1)
+    return dest
+
+
+lenna = (plt.imread("../data/lenna.png") * 255).astype(np.uint8)
+chessg = (plt.imread("../data/chessg.png") * 255).astype(np.uint8)
+
+climate = np.cumsum(np.random.rand(48, 39, 30, 251), axis=0)
+
+datasets = [
+    ('lenna uint8', lenna, [8, 8, 4]),
+    ('lenna uint8', lenna, [16, 8, 2]),
+    ('chessg uint8', chessg, [8, 8, 4]),
+    ('chessg uint8', chessg, [32, 32, 1]),
+    ('climate float32', climate.astype(np.float32), [8, 8, 8, 4]),
+    ('climate float32', climate.astype(np.float32), [16, 13, 10, 2]),
+    ('climate float64', climate, [8, 8, 8, 8]),
+    ('climate float64', climate, [16, 13, 10, 2]),
+]
+
+for name, src, ps in datasets:
+
+    np.testing.assert_array_equal(legacy(src, ps), td.tData(src, ps))
+    np.testing.assert_array_equal(plain_memcpy(src, ps), td.tData(src, ps))
+
+    time_l = best_time(lambda: legacy(src, ps))
+    time_m = best_time(lambda: plain_memcpy(src, ps))
+    time_k = best_time(lambda: td.tData(src, ps))
+
+    print('{:16s} {:18s} calculate_j: {:.4f}s  memcpy: {:.4f}s  copy kernels: {:.4f}s  '
+          'speed up: {:.2f}x (kernels {:.2f}x)'
+          .format(name, str(ps), time_l, time_m, time_k, time_l / time_k, time_m / time_k))
@@ -20,7 +20,8 @@ calculate_j(k, dim, s, sb)
 
 tData(src, dest, typesize, shape, pad_shape, sub_shape, size, dimension, inverse)
 
-    Resize data of needed dimensions and transform it.
+    Resize data of needed dimensions and transform it in a single pass (no auxiliary buffer is
+        allocated).
 
     Parameters
     ----------
@@ -62,6 +63,41 @@ tData_simple(src, dest, typesize, sub_shape, shape, dimension, inverse)
         inverse: int
 
 
+tData_part(src, dest, typesize, shape, strides, part_shape, dimension, inverse, fill, nthreads)
+
+    Calculate the data transformation of any dimension using per-axis stride tables. The
+        partitions are walked with an incremental odometer, so no index is recomputed with
+        divisions inside the copy loop. Padding is done in the same pass: the cells of the edge
+        partitions that are outside the data are filled with fill (forward) or skipped (inverse).
+        The partitions are split in contiguous ranges between nthreads threads.
+
+    Parameters
+    ----------
+        src: char*
+            Location of data to transform pointer.
+        dest: char*
+            Location of data transformed pointer.
+        typesize: int
+            Data element size.
+        shape: int[]
+            Data shape (not padded).
+        strides: int64_t[]
+            Strides (in bytes) of the original data, that can be any strided view (NULL if it is C
+            contiguous).
+        part_shape: int[]
+            Data partition shape.
+        dimension: int
+            Data dimension.
+        inverse: int
+        fill: char*
+            Location of the padding value pointer (NULL to pad with 0).
+        nthreads: int
+            Number of threads.
+
+    Built with PLAIN_MEMCPY defined, the rows are copied with plain memcpy calls instead of the
+        copy kernels (the baseline of speed-tests.py, to measure the gain of the kernels on their
+        own).
+
 padData(src, dest, typesize, shape, pad_shape, dimension)
 
     Resize orignial data padding it with 0 to obtain expandend data  wich dimension is multiple
@@ -83,43 +119,79 @@ padData(src, dest, typesize, shape, pad_shape, dimension)
             Data dimension.
 
 
-decompress_trans(comp, dest, trans_shape, part_shape, dimensions, sub_trans, dimension, b_size,
-               typesize)
+decompress_trans(comp, dest, shape, trans_shape, part_shape, start, stop, step, dimension, b_size,
+               typesize, offsets, blocks, nthreads)
 
-    Decompress partitioned data decompressing only the desired data.
+    Decompress partitioned data decompressing only the partitions that intersect the desired
+        hyper-rectangle (start:stop:step along each axis). The intersection of each partition is
+        copied straight to dest. The partitions are split between nthreads threads, each one with
+        its own Blosc decompression context. Returns 0 or a negative value if Blosc fails.
 
     Parameters
     ----------
         comp: char*
             Location of compressed data pointer.
         dest: char*
-            Location of data transformed pointer.
+            Location of desired data pointer.
+        shape: int[]
+            Original data shape.
         trans_shape: int[]
             Partitioned data shape.
         part_shape: int[]
             A data partition shape.
-        dimensions: int[]
-            Defines data desired subset.
-        sub_trans: int[]
-            Desired data shape.
+        start, stop, step: int[]
+            Defines data desired subset (0 <= start, stop <= shape and step > 0).
         dimension: int
             Data dimension.
         b_size: int
             Data partition size.
         typesize: int
             Data element size.
+        offsets: int64_t[]
+            Offset from comp of the chunk of each partition (NULL if comp is a single chunk with a
+            partition per block).
+        blocks: int64_t[]
+            Block of each partition inside its chunk (used with offsets).
+        nthreads: int
+            Number of threads.
+
+
+decompress_parts(comp, dest, parts, nparts, b_size, typesize, offsets, blocks, nthreads)
+
+    Decompress a list of partitions one after the other in dest. The partitions are split between
+        nthreads threads, each one with its own Blosc decompression context. Returns 0 or a
+        negative value if Blosc fails.
+
+    Parameters
+    ----------
+        comp: char*
+            Location of compressed data pointer.
+        dest: char*
+            Location of decompressed partitions pointer (nparts * b_size elements).
+        parts: int64_t[]
+            Partition (chunk) numbers.
+        nparts: int64_t
+            Number of partitions.
+        b_size: int
+            Data partition size.
+        typesize: int
+            Data element size.
+        offsets, blocks: int64_t[]
+            Chunk offset and block of each partition (NULL as in decompress_trans).
+        nthreads: int
+            Number of threads.
 '''
 
 from cffi import FFI
 
-ffibuilder = FFI()
+LIBRARIES = ['blosc', 'pthread']
 
-ffibuilder.set_source("tData",
-    '''
+SOURCE = '''
     #include <stdio.h>
     #include <stdint.h>
     #include <blosc.h>
     #include <time.h>
+    #include <pthread.h>
     
     int calculate_j(int k, int dim[], int s[], int sb[]) {
     
@@ -326,231 +398,665 @@ ffibuilder.set_source("tData",
         }
     }
                           
-    void tData(char* src, char* dest, int typesize, int shape[], int pad_shape[], int sub_shape[], int size, 
-        int dimension, int inverse) {
-      
-        char* src_aux = (char *) calloc (size, typesize);
-        
-        padData(src, src_aux, typesize, shape, pad_shape, dimension);
-        
-        tData_simple(src_aux, dest, typesize, sub_shape, pad_shape, dimension, inverse);
+    #define COPY_ITEMS(size)                                              \
+        for (int64_t i = 0; i < nitems; i++) {                            \
+            memcpy(&dest[i * (size)], &src[i * (size)], (size));          \
+        }
+    
+    #define COPY_RUN_MAX 16
+    
+    #ifdef PLAIN_MEMCPY
     
+    // Baseline of the copy kernels (built by speed-tests.py): one memcpy per row
+    
+    static inline void copyData(char* dest, char* src, int typesize, int64_t nitems) {
+        memcpy(dest, src, nitems * typesize);
     }
+    
+    #else
                           
-    void decompress_trans(char* comp, char* dest2, int shape[], int trans_shape[], int part_shape[], int final_s[], 
-    int dimensions[], int dimension, int b_size, int typesize){
+    static inline void copyData(char* dest, char* src, int typesize, int64_t nitems) {
     
-        int MAX_DIM = 8;
-        int DIM = dimension;
+        // Long runs are left to memcpy. Short runs of a common length in bytes or of a common
+        // typesize are copied with fixed-size moves (the compiler turns each memcpy of a constant
+        // size into plain loads and stores)
         
-        // Calculate dimensions data
+        if (nitems > COPY_RUN_MAX) {
+            memcpy(dest, src, nitems * typesize);
+            return;
+        }
         
-        int subpl[MAX_DIM], ts[MAX_DIM], ps[MAX_DIM], dim[MAX_DIM], sd[MAX_DIM], fs[MAX_DIM], s[MAX_DIM];
-    
-        for (int i = 0; i < MAX_DIM; i++) {
-            if (i < DIM) {
-                s[MAX_DIM + i - DIM] = shape[i];
-                ts[MAX_DIM + i - DIM] = trans_shape[i];
-                ps[MAX_DIM + i - DIM] = part_shape[i];
-                dim[MAX_DIM + i - DIM] = dimensions[i];
-                fs[MAX_DIM + i - DIM] = final_s[i];
-                sd[MAX_DIM + i - DIM] = trans_shape[i]/part_shape[i];
-            } else {
-                s[MAX_DIM - i - 1] = 1;
-                ts[MAX_DIM - i - 1] = 1;
-                ps[MAX_DIM - i - 1] = 1;
-                dim[MAX_DIM - i - 1] = -1;
-                sd[MAX_DIM - i - 1] = 1;
-                fs[MAX_DIM - i - 1] = 1;
-            } 
+        switch (nitems * typesize) {
+            case 4:
+                memcpy(dest, src, 4);
+                return;
+            case 8:
+                memcpy(dest, src, 8);
+                return;
+            case 16:
+                memcpy(dest, src, 16);
+                return;
+            case 32:
+                memcpy(dest, src, 32);
+                return;
+            case 64:
+                memcpy(dest, src, 64);
+                return;
         }
-    
-        int oi_s[MAX_DIM], oi_f[MAX_DIM];
         
-        for (int i = 0; i < MAX_DIM; i++) {
-            if (dim[i] != -1) {
-                subpl[i] = ps[i];
-                oi_s[i] = dim[i];
-                oi_f[i] = dim[i] + 1;
-            } else {
-                subpl[i] = ts[i];
-                oi_s[i] = 0;
-                oi_f[i] = ts[i];
-            }
+        switch (typesize) {
+            case 1:
+                COPY_ITEMS(1);
+                break;
+            case 2:
+                COPY_ITEMS(2);
+                break;
+            case 4:
+                COPY_ITEMS(4);
+                break;
+            case 8:
+                COPY_ITEMS(8);
+                break;
+            case 16:
+                COPY_ITEMS(16);
+                break;
+            default:
+                memcpy(dest, src, nitems * typesize);
         }
+    }
     
-        int subpl_size = 1;
+    #endif
+                          
+    void fillData(char* dest, char* fill, int typesize, int64_t nitems) {
     
-        for (int i = 0; i < MAX_DIM; i++) {
-            subpl_size *= subpl[i];
+        if (fill == NULL) {
+            memset(dest, 0, nitems * typesize);
+            return;
         }
+        
+        // Copy the fill value once and double the filled region until it is complete
+        
+        int64_t nbytes = nitems * typesize;
+        int64_t done = typesize;
+        
+        if (nbytes == 0) {
+            return;
+        }
+        
+        memcpy(dest, fill, typesize);
+        
+        while (done < nbytes) {
+            int64_t n = done < nbytes - done ? done : nbytes - done;
+            memcpy(&dest[done], dest, n);
+            done += n;
+        }
+    }
+                          
+    typedef struct {
+        char* src;
+        char* dest;
+        int typesize;
+        int* shape;
+        int64_t* strides;
+        int* part_shape;
+        int dimension;
+        int inverse;
+        char* fill;
+        int64_t pstart;
+        int64_t pend;
+    } tData_job;
+                          
+    void tData_range(tData_job* job) {
     
-        // Malloc buffers
-    
-        char *aux = malloc(b_size * typesize);
-        char *dest = malloc(subpl_size * typesize);
-    
-        // Calculate index to decompress
-    
-        int k, n;
-        int h2, g2, f2, e2, d2, c2, b2, a2;
-        int cont;
-    
-        for (int a = oi_s[0]/ps[0]*ps[0]; a < oi_f[0]; a += ps[0]) {
-            for (int b = oi_s[1]/ps[1]*ps[1]; b < oi_f[1]; b += ps[1]) {
-                for (int c = oi_s[2]/ps[2]*ps[2]; c < oi_f[2]; c += ps[2]) {
-                    for (int d = oi_s[3]/ps[3]*ps[3]; d < oi_f[3]; d += ps[3]) {
-                        for (int e = oi_s[4]/ps[4]*ps[4]; e < oi_f[4]; e += ps[4]) {
-                            for (int f = oi_s[5]/ps[5]*ps[5]; f < oi_f[5]; f += ps[5]) {
-                                for (int g = oi_s[6]/ps[6]*ps[6]; g < oi_f[6]; g += ps[6]) {
-                                    for (int h = oi_s[7]/ps[7]*ps[7]; h < oi_f[7]; h += ps[7]) {
-    
-                                        k = h
-                                            + g*ts[7]
-                                            + f*ts[7]*ts[6]
-                                            + e*ts[7]*ts[6]*ts[5]
-                                            + d*ts[7]*ts[6]*ts[5]*ts[4]
-                                            + c*ts[7]*ts[6]*ts[5]*ts[4]*ts[3]
-                                            + b*ts[7]*ts[6]*ts[5]*ts[4]*ts[3]*ts[2]
-                                            + a*ts[7]*ts[6]*ts[5]*ts[4]*ts[3]*ts[2]*ts[1];
-                                        
-                                        n = a/ps[0]*sd[1]*sd[2]*sd[3]*sd[4]*sd[5]*sd[6]*sd[7]
-                                            + b/ps[1]*sd[2]*sd[3]*sd[4]*sd[5]*sd[6]*sd[7]
-                                            + c/ps[2]*sd[3]*sd[4]*sd[5]*sd[6]*sd[7]
-                                            + d/ps[3]*sd[4]*sd[5]*sd[6]*sd[7]
-                                            + e/ps[4]*sd[5]*sd[6]*sd[7]
-                                            + f/ps[5]*sd[6]*sd[7]
-                                            + g/ps[6]*sd[7]
-                                            + h/ps[7];
-                                            
-                                        blosc_getitem(comp, n * b_size, b_size, aux);
-                                        
-                                        h2 = k % ts[7] % subpl[7];
-                                        g2 = k / (ts[7]) % subpl[6];
-                                        f2 = k / (ts[7]*ts[6]) % subpl[5];
-                                        e2 = k / (ts[7]*ts[6]*ts[5]) % subpl[4];
-                                        d2 = k / (ts[7]*ts[6]*ts[5]*ts[4]) % subpl[3];
-                                        c2 = k / (ts[7]*ts[6]*ts[5]*ts[4]*ts[3]) % subpl[2];
-                                        b2 = k / (ts[7]*ts[6]*ts[5]*ts[4]*ts[3]*ts[2]) % subpl[1];
-                                        a2 = k / (ts[7]*ts[6]*ts[5]*ts[4]*ts[3]*ts[2]*ts[1]) % subpl[0];
-                                        
-                                        // Copy block to final data
+        int DIM = job->dimension;
+        int typesize = job->typesize;
+        int* shape = job->shape;
+        int* part_shape = job->part_shape;
+        
+        // Stride tables (in bytes) of the original layout and of a partition
+        
+        int64_t nparts[DIM], stride[DIM], pstride[DIM], bstride[DIM], ext[DIM], pc[DIM], w[DIM];
+        int64_t nbytes = typesize, bbytes = typesize;
+        
+        for (int i = DIM - 1; i >= 0; i--) {
+            nparts[i] = (shape[i] + part_shape[i] - 1) / part_shape[i];
+            stride[i] = job->strides != NULL ? job->strides[i] : nbytes;
+            pstride[i] = stride[i] * part_shape[i];
+            bstride[i] = bbytes;
+            nbytes *= shape[i];
+            bbytes *= part_shape[i];
+            w[i] = 0;
+        }
+        
+        // Position of the first partition of the range
+        
+        int64_t poff = 0, rest = job->pstart;
+        
+        for (int i = DIM - 1; i >= 0; i--) {
+            pc[i] = rest % nparts[i];
+            rest /= nparts[i];
+            poff += pc[i] * pstride[i];
+        }
+        
+        // Partitions are stored one after the other, in C order, both inside and between them
+        
+        char* block = job->inverse ? job->src : job->dest;
+        char* data = job->inverse ? job->dest : job->src;
+        
+        for (int64_t n = job->pstart; n < job->pend; n++) {
+        
+            char* b = &block[n * bbytes];
+            int64_t off = poff, boff = 0;
+            int i, edge = 0;
+            
+            // Edge partitions are only partially inside the original data
+            
+            for (i = 0; i < DIM; i++) {
+                ext[i] = shape[i] - pc[i] * part_shape[i];
+                if (ext[i] >= part_shape[i]) {
+                    ext[i] = part_shape[i];
+                } else {
+                    edge = 1;
+                }
+            }
+            
+            if (edge && job->inverse == 0) {
+                fillData(b, job->fill, typesize, bbytes / typesize);
+            }
+            
+            int64_t run = ext[DIM - 1];
+            
+            for (;;) {
+            
+                if (stride[DIM - 1] != typesize) {
+                    for (int64_t j = 0; j < run; j++) {
+                        if (job->inverse == 0) {
+                            memcpy(&b[boff + j * typesize], &data[off + j * stride[DIM - 1]], typesize);
+                        } else {
+                            memcpy(&data[off + j * stride[DIM - 1]], &b[boff + j * typesize], typesize);
+                        }
+                    }
+                } else if (job->inverse == 0) {
+                    copyData(&b[boff], &data[off], typesize, run);
+                } else {
+                    copyData(&data[off], &b[boff], typesize, run);
+                }
+                
+                // Next row inside the partition
+                
+                for (i = DIM - 2; i >= 0; i--) {
+                    w[i]++;
+                    off += stride[i];
+                    boff += bstride[i];
+                    if (w[i] < ext[i]) {
+                        break;
+                    }
+                    off -= ext[i] * stride[i];
+                    boff -= ext[i] * bstride[i];
+                    w[i] = 0;
+                }
+                
+                if (i < 0) {
+                    break;
+                }
+            }
+            
+            // Next partition
+            
+            for (i = DIM - 1; i >= 0; i--) {
+                pc[i]++;
+                poff += pstride[i];
+                if (pc[i] < nparts[i]) {
+                    break;
+                }
+                poff -= nparts[i] * pstride[i];
+                pc[i] = 0;
+            }
+        }
+    }
+                          
+    void* tData_worker(void* job) {
     
-                                        cont = 0;
+        tData_range((tData_job*) job);
+        
+        return NULL;
+    }
+                          
+    void tData_part(char* src, char* dest, int typesize, int shape[], int64_t strides[], int part_shape[],
+        int dimension, int inverse, char* fill, int nthreads) {
     
-                                        for (int ra = a2; ra < a2 + ps[0]; ra++) {
-                                            for (int rb = b2; rb < b2 + ps[1]; rb++) {
-                                                for (int rc = c2; rc < c2 + ps[2]; rc++) {
-                                                    for (int rd = d2; rd < d2 + ps[3]; rd++) {
-                                                        for (int re = e2; re < e2 + ps[4]; re++) {
-                                                            for (int rf = f2; rf < f2 + ps[5]; rf++) {
-                                                                for (int rg = g2; rg < g2 + ps[6]; rg++) {
+        int64_t npart = 1;
+        
+        for (int i = 0; i < dimension; i++) {
+            npart *= (shape[i] + part_shape[i] - 1) / part_shape[i];
+        }
+        
+        if (npart == 0) {
+            return;
+        }
+        
+        if (nthreads > npart) {
+            nthreads = npart;
+        }
+        
+        if (nthreads < 1) {
+            nthreads = 1;
+        }
+        
+        // Split the partitions in contiguous ranges (each thread writes a disjoint region of dest)
+        
+        tData_job jobs[nthreads];
+        pthread_t threads[nthreads];
+        
+        for (int t = 0; t < nthreads; t++) {
+            jobs[t].src = src;
+            jobs[t].dest = dest;
+            jobs[t].typesize = typesize;
+            jobs[t].shape = shape;
+            jobs[t].strides = strides;
+            jobs[t].part_shape = part_shape;
+            jobs[t].dimension = dimension;
+            jobs[t].inverse = inverse;
+            jobs[t].fill = fill;
+            jobs[t].pstart = npart * t / nthreads;
+            jobs[t].pend = npart * (t + 1) / nthreads;
+        }
+        
+        if (nthreads == 1) {
+            tData_range(&jobs[0]);
+            return;
+        }
+        
+        // The range of a thread that can not be created is transformed by this one
+        
+        int created[nthreads];
+        
+        for (int t = 0; t < nthreads; t++) {
+            created[t] = pthread_create(&threads[t], NULL, tData_worker, &jobs[t]) == 0;
+            if (!created[t]) {
+                tData_range(&jobs[t]);
+            }
+        }
+        
+        for (int t = 0; t < nthreads; t++) {
+            if (created[t]) {
+                pthread_join(threads[t], NULL);
+            }
+        }
+    }
+                          
+    void tData(char* src, char* dest, int typesize, int shape[], int pad_shape[], int sub_shape[], int size, 
+        int dimension, int inverse) {
+      
+        tData_part(src, dest, typesize, shape, NULL, sub_shape, dimension, inverse, NULL, 1);
     
-                                                                k = h2
-                                                                    + rg * subpl[7]
-                                                                    + rf * subpl[7]*subpl[6]
-                                                                    + re * subpl[7]*subpl[6]*subpl[5]
-                                                                    + rd * subpl[7]*subpl[6]*subpl[5]*subpl[4]
-                                                                    + rc * subpl[7]*subpl[6]*subpl[5]*subpl[4]*subpl[3]
-                                                                    + rb * subpl[7]*subpl[6]*subpl[5]*subpl[4]*subpl[3]*subpl[2]
-                                                                    + ra * subpl[7]*subpl[6]*subpl[5]*subpl[4]*subpl[3]*subpl[2]*subpl[1];
+    }
+                          
+    typedef struct {
+        char* comp;
+        char* dest;
+        int* part_shape;
+        int* start;
+        int* stop;
+        int* step;
+        int dimension;
+        int b_size;
+        int typesize;
+        int64_t* nparts;
+        int64_t* pc0;
+        int64_t* pc1;
+        int64_t* dstride;
+        int64_t* offsets;
+        int64_t* blocks;
+        int64_t first;
+        int64_t last;
+        int rc;
+    } decompress_job;
+                          
+    void decompress_range(decompress_job* job) {
     
-                                                                    memcpy(&dest[k * typesize], &aux[cont * typesize], ps[7] * typesize);
-                                                                    cont += ps[7];
-                                                                }
-                                                            }
-                                                        }
-                                                    }
-                                                }
-                                            }
-                                        }
-                                        
-                                    }
-                                }
-                            }
+        int DIM = job->dimension;
+        int typesize = job->typesize;
+        int* part_shape = job->part_shape;
+        int* start = job->start;
+        int* stop = job->stop;
+        int* step = job->step;
+        int64_t* pc0 = job->pc0;
+        int64_t* pc1 = job->pc1;
+        int64_t* dstride = job->dstride;
+        int i;
+        
+        // Stride table (in bytes) of a partition
+        
+        int64_t pstride[DIM], pc[DIM], cnt[DIM], w[DIM];
+        int64_t nbytes = typesize;
+        
+        for (i = DIM - 1; i >= 0; i--) {
+            pstride[i] = nbytes;
+            nbytes *= part_shape[i];
+            w[i] = 0;
+        }
+        
+        // Position of the first partition of the range
+        
+        int64_t rest = job->first;
+        
+        for (i = DIM - 1; i >= 0; i--) {
+            pc[i] = pc0[i] + rest % (pc1[i] - pc0[i]);
+            rest /= pc1[i] - pc0[i];
+        }
+        
+        // Each thread uses its own decompression context and buffer
+        
+        blosc2_dparams dparams = {1, NULL};
+        blosc2_context* dctx = blosc2_create_dctx(dparams);
+        
+        char *aux = malloc(nbytes);
+        
+        job->rc = 0;
+        
+        for (int64_t k = job->first; k < job->last; k++) {
+        
+            // Intersection of the partition with the hyper-rectangle
+            
+            int64_t n = 0, soff = 0, doff = 0;
+            int empty = 0;
+            
+            for (i = 0; i < DIM; i++) {
+                int64_t lo = pc[i] * part_shape[i];
+                int64_t hi = lo + part_shape[i];
+                int64_t k0 = ((lo > start[i] ? lo : start[i]) - start[i] + step[i] - 1) / step[i];
+                int64_t k1 = ((hi < stop[i] ? hi : stop[i]) - start[i] + step[i] - 1) / step[i];
+                cnt[i] = k1 - k0;
+                if (cnt[i] <= 0) {
+                    empty = 1;
+                }
+                n = n * job->nparts[i] + pc[i];
+                soff += (start[i] + k0 * step[i] - lo) * pstride[i];
+                doff += k0 * dstride[i];
+            }
+            
+            if (!empty) {
+            
+                char* chunk = job->comp;
+                int64_t block = n;
+                
+                if (job->offsets != NULL) {
+                    chunk += job->offsets[n];
+                    block = job->blocks[n];
+                }
+                
+                if (blosc2_getitem_ctx(dctx, chunk, block * job->b_size, job->b_size, aux) < 0) {
+                    job->rc = -1;
+                    break;
+                }
+                
+                // Copy the intersection straight to its final position
+                
+                for (;;) {
+                
+                    if (step[DIM - 1] == 1) {
+                        copyData(&job->dest[doff], &aux[soff], typesize, cnt[DIM - 1]);
+                    } else {
+                        for (int64_t j = 0; j < cnt[DIM - 1]; j++) {
+                            memcpy(&job->dest[doff + j * typesize], &aux[soff + j * step[DIM - 1] * typesize],
+                                   typesize);
+                        }
+                    }
+                    
+                    for (i = DIM - 2; i >= 0; i--) {
+                        w[i]++;
+                        soff += step[i] * pstride[i];
+                        doff += dstride[i];
+                        if (w[i] < cnt[i]) {
+                            break;
                         }
+                        soff -= cnt[i] * step[i] * pstride[i];
+                        doff -= cnt[i] * dstride[i];
+                        w[i] = 0;
+                    }
+                    
+                    if (i < 0) {
+                        break;
                     }
                 }
             }
+            
+            // Next partition
+            
+            for (i = DIM - 1; i >= 0; i--) {
+                pc[i]++;
+                if (pc[i] < pc1[i]) {
+                    break;
+                }
+                pc[i] = pc0[i];
+            }
         }
+        
+        free(aux);
+        blosc2_free_ctx(dctx);
+    }
+                          
+    void* decompress_worker(void* job) {
     
-        // Reduce final data
+        decompress_range((decompress_job*) job);
         
-        int ini[MAX_DIM], fin[MAX_DIM];
+        return NULL;
+    }
+                          
+    typedef struct {
+        char* comp;
+        char* dest;
+        int64_t* parts;
+        int b_size;
+        int typesize;
+        int64_t* offsets;
+        int64_t* blocks;
+        int64_t first;
+        int64_t last;
+        int rc;
+    } parts_job;
+                          
+    void* decompress_parts_worker(void* arg) {
+    
+        parts_job* job = (parts_job*) arg;
+        int64_t bbytes = (int64_t) job->b_size * job->typesize;
         
-        for (int i = 0; i < MAX_DIM - 1; i += 1) {
-            if (dim[i] != -1) {
-                ini[i] = dim[i] % ps[i];
-                fin[i] = dim[i] % ps[i] + 1;
+        blosc2_dparams dparams = {1, NULL};
+        blosc2_context* dctx = blosc2_create_dctx(dparams);
+        
+        job->rc = 0;
+        
+        for (int64_t k = job->first; k < job->last; k++) {
+            char* chunk = job->comp;
+            int64_t block = job->parts[k];
+            
+            if (job->offsets != NULL) {
+                chunk += job->offsets[block];
+                block = job->blocks[block];
             }
-            else {
-                ini[i] = 0;
-                fin[i] = s[i];
+            
+            if (blosc2_getitem_ctx(dctx, chunk, block * job->b_size, job->b_size, &job->dest[k * bbytes]) < 0) {
+                job->rc = -1;
+                break;
             }
         }
         
-        if (dim[MAX_DIM - 1] != -1) {
-            ini[MAX_DIM - 1] = dim[MAX_DIM - 1] % ps[MAX_DIM - 1];
-            fin[MAX_DIM - 1] = dim[MAX_DIM - 1] % ps[MAX_DIM - 1] + 1 ;
+        blosc2_free_ctx(dctx);
+        
+        return NULL;
+    }
+                          
+    int decompress_parts(char* comp, char* dest, int64_t parts[], int64_t nparts, int b_size, int typesize,
+        int64_t offsets[], int64_t blocks[], int nthreads) {
+    
+        if (nthreads > nparts) {
+            nthreads = nparts;
+        }
+        
+        if (nthreads < 1) {
+            nthreads = 1;
+        }
+        
+        parts_job jobs[nthreads];
+        pthread_t threads[nthreads];
+        
+        for (int t = 0; t < nthreads; t++) {
+            jobs[t].comp = comp;
+            jobs[t].dest = dest;
+            jobs[t].parts = parts;
+            jobs[t].b_size = b_size;
+            jobs[t].typesize = typesize;
+            jobs[t].offsets = offsets;
+            jobs[t].blocks = blocks;
+            jobs[t].first = nparts * t / nthreads;
+            jobs[t].last = nparts * (t + 1) / nthreads;
+        }
+        
+        if (nthreads == 1) {
+            decompress_parts_worker(&jobs[0]);
         } else {
-            ini[MAX_DIM - 1] = 0;
-            fin[MAX_DIM - 1] = 1;
-        }
-        
-        cont = 0;
-        
-        for (int a = ini[0]; a < fin[0]; a += 1) {
-            for (int b = ini[1]; b < fin[1]; b += 1) {
-                for (int c = ini[2]; c < fin[2]; c += 1) {
-                    for (int d = ini[3]; d < fin[3]; d += 1) {
-                        for (int e = ini[4]; e < fin[4]; e += 1) {
-                            for (int f = ini[5]; f < fin[5]; f += 1) {
-                                for (int g = ini[6]; g < fin[6]; g += 1) {
-                                    for (int h = ini[7]; h < fin[7]; h += 1) {
-        
-                                        k = h
-                                            + g * subpl[7]
-                                            + f * subpl[7]*subpl[6]
-                                            + e * subpl[7]*subpl[6]*subpl[5]
-                                            + d * subpl[7]*subpl[6]*subpl[5]*subpl[4]
-                                            + c * subpl[7]*subpl[6]*subpl[5]*subpl[4]*subpl[3]
-                                            + b * subpl[7]*subpl[6]*subpl[5]*subpl[4]*subpl[3]*subpl[2]
-                                            + a * subpl[7]*subpl[6]*subpl[5]*subpl[4]*subpl[3]*subpl[2]*subpl[1];
-        
-                                        memcpy(&dest2[cont * typesize], &dest[k * typesize], fs[7] * typesize);
-                                        cont += fs[7];
-                                        
-                                    }
-                                }
-                            }
-                        }
-                    }
+            int created[nthreads];
+            
+            for (int t = 0; t < nthreads; t++) {
+                created[t] = pthread_create(&threads[t], NULL, decompress_parts_worker, &jobs[t]) == 0;
+                if (!created[t]) {
+                    decompress_parts_worker(&jobs[t]);
+                }
+            }
+            for (int t = 0; t < nthreads; t++) {
+                if (created[t]) {
+                    pthread_join(threads[t], NULL);
                 }
             }
         }
         
-        free(aux);
-        free(dest);
+        int rc = 0;
+        
+        for (int t = 0; t < nthreads; t++) {
+            if (jobs[t].rc < 0) {
+                rc = jobs[t].rc;
+            }
+        }
+        
+        return rc;
+    }
+                          
+    int decompress_trans(char* comp, char* dest, int shape[], int trans_shape[], int part_shape[], int start[],
+        int stop[], int step[], int dimension, int b_size, int typesize, int64_t offsets[], int64_t blocks[],
+        int nthreads) {
+    
+        int DIM = dimension;
+        int i;
+        
+        // Partitions touched by the hyper-rectangle and strides (in bytes) of the desired data
+        
+        int64_t nparts[DIM], pc0[DIM], pc1[DIM], dstride[DIM];
+        int64_t nfs = typesize, npart = 1;
+        
+        for (i = DIM - 1; i >= 0; i--) {
+            int64_t fs = stop[i] > start[i] ? (stop[i] - start[i] + step[i] - 1) / step[i] : 0;
+            nparts[i] = trans_shape[i] / part_shape[i];
+            pc0[i] = start[i] / part_shape[i];
+            pc1[i] = fs > 0 ? (stop[i] - 1) / part_shape[i] + 1 : pc0[i];
+            dstride[i] = nfs;
+            nfs *= fs;
+            npart *= pc1[i] - pc0[i];
+        }
+        
+        if (nfs == 0) {
+            return 0;
+        }
+        
+        // Decompress the touched partitions and copy them to dest (in parallel)
+        
+        if (nthreads > npart) {
+            nthreads = npart;
+        }
+        
+        if (nthreads < 1) {
+            nthreads = 1;
+        }
+        
+        decompress_job jobs[nthreads];
+        pthread_t threads[nthreads];
+        
+        for (int t = 0; t < nthreads; t++) {
+            jobs[t].comp = comp;
+            jobs[t].dest = dest;
+            jobs[t].part_shape = part_shape;
+            jobs[t].start = start;
+            jobs[t].stop = stop;
+            jobs[t].step = step;
+            jobs[t].dimension = dimension;
+            jobs[t].b_size = b_size;
+            jobs[t].typesize = typesize;
+            jobs[t].nparts = nparts;
+            jobs[t].pc0 = pc0;
+            jobs[t].pc1 = pc1;
+            jobs[t].dstride = dstride;
+            jobs[t].offsets = offsets;
+            jobs[t].blocks = blocks;
+            jobs[t].first = npart * t / nthreads;
+            jobs[t].last = npart * (t + 1) / nthreads;
+        }
+        
+        if (nthreads == 1) {
+            decompress_range(&jobs[0]);
+        } else {
+            int created[nthreads];
+            
+            for (int t = 0; t < nthreads; t++) {
+                created[t] = pthread_create(&threads[t], NULL, decompress_worker, &jobs[t]) == 0;
+                if (!created[t]) {
+                    decompress_range(&jobs[t]);
+                }
+            }
+            for (int t = 0; t < nthreads; t++) {
+                if (created[t]) {
+                    pthread_join(threads[t], NULL);
+                }
+            }
+        }
+        
+        int rc = 0;
+        
+        for (int t = 0; t < nthreads; t++) {
+            if (jobs[t].rc < 0) {
+                rc = jobs[t].rc;
+            }
+        }
+        
+        return rc;
     }
     
-    ''', libraries=['blosc'])
-
-ffibuilder.cdef(
     '''
+
+CDEF = '''
     void tData(char* src, char* dest, int typesize, int shape[], int pad_shape[], int sub_shape[], int size,
         int dimension, int inverse);
 
     void tData_simple(char* src, char* dest, int typesize, int sub_shape[], int shape[], int dimension, int inverse);
 
+    void tData_part(char* src, char* dest, int typesize, int shape[], int64_t strides[], int part_shape[],
+        int dimension, int inverse, char* fill, int nthreads);
+
     void padData(char* src, char* dest, int typesize, int shape[], int pad_shape[], int dimension);
 
 
     int calculate_j(int k, int dim[], int s[], int sb[]);
 
-    void decompress_trans(char* comp, char* dest2, int shape[], int trans_shape[], int part_shape[], int final_s[],
-        int dimensions[], int dimension, int b_size, int typesize);
+    int decompress_trans(char* comp, char* dest, int shape[], int trans_shape[], int part_shape[], int start[],
+        int stop[], int step[], int dimension, int b_size, int typesize, int64_t offsets[], int64_t blocks[],
+        int nthreads);
+
+    int decompress_parts(char* comp, char* dest, int64_t parts[], int64_t nparts, int b_size, int typesize,
+        int64_t offsets[], int64_t blocks[], int nthreads);
     '''
-)
+
+ffibuilder = FFI()
+ffibuilder.set_source("tData", SOURCE, libraries=LIBRARIES)
+ffibuilder.cdef(CDEF)
 
 if __name__ == "__main__":
     ffibuilder.compile(verbose=True)
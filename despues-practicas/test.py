@@ -2,9 +2,11 @@
 Test para comprobar que el algoritmo implementado de decompresión funciona
 """
 
+import os
 import transformData as td
 import numpy as np
 import pytest
+import threading
 
 
 @pytest.fixture(scope="module",
@@ -27,28 +29,53 @@ def shapes(request):
 def test_algoritm(shapes):
     shape, part_shape, index = shapes
 
-    # Create slices
+    # Create key
 
-    slices = []
-    for i in range(len(shape)):
-        if index[i] != -1:
-            slices.append(slice(index[i], index[i] + 1))
-        else:
-            slices.append(slice(0, shape[i]))
-    slices = tuple(slices)
+    key = tuple(slice(None) if index[i] == -1 else index[i] for i in range(len(shape)))
+
+    # Test
 
-    # Create indexes
+    size = np.prod(shape)
 
-    a = index[0]
-    b = index[1]
-    c = index[2]
-    d = index[3]
-    e = index[4]
-    f = index[5]
-    g = index[6]
-    h = index[7]
+    src = np.arange(size, dtype=np.int32).reshape(shape)
 
-    # Test
+    src_trans = td.tData(src, part_shape)
+
+    trans_shape = src_trans.shape
+
+    comp = td.compress(src_trans, part_shape)
+
+    dest = td.decompress_trans(comp, shape, trans_shape, part_shape, src.dtype, key)
+
+    np.testing.assert_array_equal(src[key], dest)
+
+
+@pytest.mark.parametrize("key", [
+    (slice(1, 3), Ellipsis),
+    (Ellipsis, slice(None, None, 2)),
+    (slice(None, None, -1), 1),
+    (-1, slice(2, 0, -1), Ellipsis),
+    (slice(3, 1),),
+    (slice(0, 4, 3), slice(1, 4, 2), Ellipsis, slice(None, None, -3)),
+])
+def test_slices(shapes, key):
+    shape, part_shape, index = shapes
+
+    size = np.prod(shape)
+
+    src = np.arange(size, dtype=np.int32).reshape(shape)
+
+    src_trans = td.tData(src, part_shape)
+
+    comp = td.compress(src_trans, part_shape)
+
+    dest = td.decompress_trans(comp, shape, src_trans.shape, part_shape, src.dtype, key)
+
+    np.testing.assert_array_equal(src[key], dest)
+
+
+def test_tData_part(shapes):
+    shape, part_shape, index = shapes
 
     size = np.prod(shape)
 
@@ -58,8 +85,745 @@ def test_algoritm(shapes):
 
     trans_shape = src_trans.shape
 
+    # Transform with the calculate_j algorithm
+
+    src_pad = np.zeros(trans_shape, dtype=src.dtype)
+    src_pad[tuple(slice(0, n) for n in shape)] = src
+
+    res = np.empty_like(src_pad)
+
+    td.lib.tData_simple(td.ffi.from_buffer(src_pad), td.ffi.from_buffer(res), src.dtype.itemsize,
+                        part_shape, trans_shape, len(shape), 0)
+
+    np.testing.assert_array_equal(res, src_trans)
+
+    # Test inverse
+
+    dest = td.tData(src_trans, part_shape, inverse=True)
+
+    np.testing.assert_array_equal(src_pad, dest)
+
+
+def test_tData_inverse_crop(shapes):
+    shape, part_shape, index = shapes
+
+    src = np.arange(np.prod(shape), dtype=np.int16).reshape(shape)
+
+    src_trans = td.tData(src, part_shape, fill=3)
+
+    np.testing.assert_array_equal(src, td.tData(src_trans, part_shape, inverse=True, shape=shape, nthreads=2))
+
+    plan = td.get_plan(shape, part_shape, src.dtype)
+    out = np.empty(shape, dtype=src.dtype)
+
+    assert td.tData(src_trans.reshape(-1), part_shape, inverse=True, plan=plan, out=out) is out
+    np.testing.assert_array_equal(src, out)
+
+    out = np.empty(src_trans.shape, dtype=src.dtype)
+    assert td.tData(src, part_shape, fill=3, out=out) is out
+    np.testing.assert_array_equal(src_trans, out)
+
+    with pytest.raises(ValueError):
+        td.tData(src_trans, part_shape, inverse=True, shape=shape, out=np.empty(shape, dtype=np.int32))
+
+    with pytest.raises(ValueError):
+        td.tData(src_trans[..., :1], part_shape, inverse=True, shape=shape)
+
+    with pytest.raises(ValueError):
+        td.tData(src, part_shape, shape=shape)
+
+
+def test_tData_fill(shapes):
+    shape, part_shape, index = shapes
+
+    size = np.prod(shape)
+
+    src = np.arange(size, dtype=np.int32).reshape(shape)
+
+    src_trans = td.tData(src, part_shape, fill=-7)
+
+    # Pad and transform in two passes
+
+    src_pad = np.full(src_trans.shape, -7, dtype=src.dtype)
+    src_pad[tuple(slice(0, n) for n in shape)] = src
+
+    res = td.tData(src_pad, part_shape)
+
+    np.testing.assert_array_equal(res, src_trans)
+
+
+@pytest.mark.parametrize("nthreads", [2, 3, 8])
+def test_tData_threads(shapes, nthreads):
+    shape, part_shape, index = shapes
+
+    size = np.prod(shape)
+
+    src = np.arange(size, dtype=np.int32).reshape(shape)
+
+    src_trans = td.tData(src, part_shape)
+
+    res = td.tData(src, part_shape, nthreads=nthreads)
+
+    np.testing.assert_array_equal(src_trans, res)
+
+    dest = td.tData(res, part_shape, inverse=True, nthreads=nthreads)
+
+    np.testing.assert_array_equal(td.tData(src_trans, part_shape, inverse=True), dest)
+
+
+def test_plan(shapes):
+    shape, part_shape, index = shapes
+
+    plan = td.get_plan(shape, part_shape, np.float32)
+
+    assert plan is td.get_plan(tuple(shape), tuple(part_shape), np.int32)
+    assert plan is not td.get_plan(shape, part_shape, np.float64)
+
+    src = np.arange(np.prod(shape), dtype=np.int32).reshape(shape)
+    src_trans = td.tData(src, part_shape, plan=plan)
+
+    assert src_trans.shape == plan.trans_shape
+    assert plan.npart * plan.part_size == src_trans.size
+
+    with pytest.raises(ValueError):
+        td.tData(src.astype(np.int64), part_shape, plan=plan)
+
+
+@pytest.mark.parametrize("nthreads", [2, 5])
+def test_decompress_threads(shapes, nthreads):
+    shape, part_shape, index = shapes
+
+    key = tuple(slice(None) if index[i] == -1 else index[i] for i in range(len(shape)))
+
+    size = np.prod(shape)
+
+    src = np.arange(size, dtype=np.int32).reshape(shape)
+
+    src_trans = td.tData(src, part_shape)
+
     comp = td.compress(src_trans, part_shape)
 
-    dest = td.decompress_trans(comp, shape, trans_shape, part_shape, a, b, c, d, e, f, g, h)
+    dest = td.decompress_trans(comp, shape, src_trans.shape, part_shape, src.dtype, key, nthreads=nthreads)
+
+    np.testing.assert_array_equal(src[key], dest)
+
+
+def test_decompress_cache(shapes, monkeypatch):
+    shape, part_shape, index = shapes
+
+    monkeypatch.setattr(td, 'POINTS_BATCH_NBYTES', 1)
+
+    key = tuple(slice(None) if index[i] == -1 else index[i] for i in range(len(shape)))
+
+    size = np.prod(shape)
+
+    src = np.arange(size, dtype=np.int32).reshape(shape)
+
+    src_trans = td.tData(src, part_shape)
+
+    comp = td.compress(src_trans, part_shape)
+
+    part_nbytes = np.prod(part_shape) * src.dtype.itemsize
+
+    cache = td.PartitionCache(4 * part_nbytes)
+
+    dest = td.decompress_trans(comp, shape, src_trans.shape, part_shape, src.dtype, key, cache=cache,
+                               dataset='src')
+
+    np.testing.assert_array_equal(src[key], dest)
+
+    assert cache.nbytes <= 4 * part_nbytes
+    assert len(cache) == min(cache.misses, 4)
+    assert all(part.base is None and part.nbytes == part_nbytes for part in cache._parts.values())
+    assert cache.evictions == cache.misses - len(cache)
+
+    # Repeat a query
+
+    key = (slice(None, None, 2),) + (0,) * (len(shape) - 1)
+
+    dest = td.decompress_trans(comp, shape, src_trans.shape, part_shape, src.dtype, key, cache=cache,
+                               dataset='src')
+
+    hits, misses = cache.hits, cache.misses
+
+    dest = td.decompress_trans(comp, shape, src_trans.shape, part_shape, src.dtype, key, cache=cache,
+                               dataset='src', nthreads=3)
+
+    np.testing.assert_array_equal(src[key], dest)
+
+    touched = -(-shape[0] // part_shape[0])
+
+    if touched <= 4:
+        assert cache.hits - hits == touched and cache.misses == misses
+
+
+@pytest.mark.parametrize("batch_nbytes", [1, 64 * 2 ** 20])
+def test_take_points(shapes, batch_nbytes, monkeypatch):
+    shape, part_shape, index = shapes
+
+    monkeypatch.setattr(td, 'POINTS_BATCH_NBYTES', batch_nbytes)
+
+    size = np.prod(shape)
+
+    src = np.arange(size, dtype=np.int32).reshape(shape)
+
+    src_trans = td.tData(src, part_shape)
+
+    comp = td.compress(src_trans, part_shape)
+
+    plan = td.get_plan(shape, part_shape, src.dtype)
+
+    coords = np.random.randint(0, np.array(shape), size=(500, len(shape)))
+    coords[:10] -= np.array(shape)
+
+    dest = td.take_points(comp, plan, coords, src.dtype, nthreads=2)
+
+    np.testing.assert_array_equal(src[tuple(coords.T)], dest)
+
+    with pytest.raises(IndexError):
+        td.take_points(comp, plan, [shape], src.dtype)
+
+
+@pytest.mark.parametrize("key", [
+    (Ellipsis,),
+    (1, slice(None, None, -2)),
+    ([0, 3, 1],),
+    (slice(1, None), [2, 0, 2]),
+    (0, Ellipsis, [1, 1, 0]),
+    ([1, 2], [0, 3], Ellipsis),
+    (np.array([[0, 1], [3, 2]]), slice(None), np.array([1, 0])),
+    ('mask', 2),
+])
+def test_compressed_array(shapes, key):
+    shape, part_shape, index = shapes
+
+    size = np.prod(shape)
+
+    src = np.arange(size, dtype=np.float64).reshape(shape)
+
+    cache = td.PartitionCache(2 ** 20)
+
+    arr = td.CompressedPartitionedArray(src, part_shape, nthreads=2, cache=cache)
+
+    assert arr.shape == src.shape and arr.dtype == src.dtype
+    assert arr.nbytes == src.nbytes and 0 < arr.cbytes
+
+    key = tuple(np.arange(shape[i]) % 3 == 0 if isinstance(k, str) else k for i, k in enumerate(key))
+
+    np.testing.assert_array_equal(src[key], arr[key])
+
+    if len(shape) == 3:
+        np.testing.assert_array_equal(src, np.asarray(arr))
+
+
+@pytest.mark.parametrize("key, nrows", [
+    (([0, 999], slice(None)), 2),
+    (([999, 0, 5, 999], slice(3, 7)), 7),
+    ((np.array([[12, 17], [998, 11]]), slice(9, 2, -3)), 8),
+])
+def test_compressed_array_sparse(key, nrows):
+    src = np.arange(1000 * 16, dtype=np.int64).reshape(1000, 16)
+
+    arr = td.CompressedPartitionedArray(src, [10, 16])
+
+    # Only the rows between the indices that share a partition are decompressed
+
+    rows = []
+    decompress = arr._decompress
+    arr._decompress = lambda key: rows.append(len(range(*key[0].indices(1000)))) or decompress(key)
+
+    np.testing.assert_array_equal(src[key], arr[key])
+    assert sum(rows) == nrows
+
+
+@pytest.mark.parametrize("dtype", [np.int32, np.float64])
+@pytest.mark.parametrize("axis", [None, 0, -1, (0, 1)])
+def test_reductions(shapes, dtype, axis, monkeypatch):
+    shape, part_shape, index = shapes
+
+    monkeypatch.setattr(td, 'REDUCE_BATCH_NBYTES', 1)
+
+    size = np.prod(shape)
+
+    src = (np.arange(size) - size // 3).astype(dtype).reshape(shape)
+
+    arr = td.CompressedPartitionedArray(src, part_shape)
+
+    np.testing.assert_allclose(src.sum(axis=axis), arr.sum(axis=axis), rtol=1e-5)
+    np.testing.assert_allclose(src.mean(axis=axis), arr.mean(axis=axis, nthreads=2), rtol=1e-5)
+    np.testing.assert_array_equal(src.min(axis=axis), arr.min(axis=axis))
+    np.testing.assert_array_equal(src.max(axis=axis), arr.max(axis=axis, nthreads=3))
+
+
+@pytest.mark.parametrize("op, sign, values", [('>', 1, [0, 30, 31]),
+                                               ('>=', 1, [0.5, 31, 41]),
+                                               ('<', -1, [0, -30, -31]),
+                                               ('<=', -1, [-0.5, -31, -41]),
+                                               ('==', 1, [5, 30, 31]),
+                                               ('!=', 1, [0])])
+def test_where(shapes, op, sign, values):
+    shape, part_shape, index = shapes
+
+    size = np.prod(shape)
+
+    src = np.zeros(size, dtype=np.float64).reshape(shape)
+    src[(0,) * len(shape)] = 5 * sign
+    src[tuple(n - 1 for n in shape)] = 40 * sign
+    src[tuple(n // 2 for n in shape)] = 31 * sign
+
+    arr = td.CompressedPartitionedArray(src, part_shape, nthreads=2)
+
+    assert arr.zonemap['zero'].sum() >= len(arr.zonemap) - 3
+
+    for value in values:
+        np.testing.assert_array_equal(np.argwhere(td._OPERATORS[op](src, value)), arr.where(op, value))
+
+
+@pytest.mark.parametrize("op", ['>', '>=', '<', '<=', '==', '!='])
+def test_where_nan(op):
+    src = np.full([20, 12], 5.0)
+    src[3, 3] = np.nan
+    src[15:, :4] = np.nan
+
+    arr = td.CompressedPartitionedArray(src, [8, 4])
+
+    assert arr.zonemap['nan'].sum() == 21
+    assert not arr.zonemap['constant'][0]
+
+    for value in [5, 4]:
+        np.testing.assert_array_equal(np.argwhere(td._OPERATORS[op](src, value)), arr.where(op, value))
+
+
+@pytest.mark.parametrize("codec, clevel, filters", [('blosclz', 9, (td.BLOSC_SHUFFLE,)),
+                                                     ('lz4', 5, (td.BLOSC_BITSHUFFLE,)),
+                                                     ('zstd', 1, (td.BLOSC_SHUFFLE, td.BLOSC_BITSHUFFLE)),
+                                                     (1, 0, ())])
+def test_compress_params(codec, clevel, filters):
+    shape, part_shape = [37, 20, 11], [8, 5, 4]
+
+    src = np.arange(np.prod(shape), dtype=np.int32).reshape(shape)
+    src_trans = td.tData(src, part_shape)
+
+    comp = td.compress(src_trans, part_shape, codec=codec, clevel=clevel, filters=filters, nthreads=2)
+
+    dest = td.decompress_trans(comp, shape, src_trans.shape, part_shape, src.dtype, nthreads=2)
+
+    np.testing.assert_array_equal(src, dest)
+
+    with pytest.raises(ValueError):
+        td.compress(src_trans, part_shape, codec='nocodec')
+
+
+def test_compress_concurrent():
+    results = {}
+
+    def ingest(name, part_shape):
+        src = np.arange(64 ** 3, dtype=np.float32).reshape(64, 64, 64)
+        try:
+            for _ in range(5):
+                comp = td.compress(td.tData(src, part_shape), part_shape, codec='lz4', clevel=5)
+
+                # The blocks must be the partitions of this thread
+
+                assert td.cb2.blosc_cbuffer_sizes(comp)[2] == np.prod(part_shape) * src.itemsize
+
+                dest = td.decompress_trans(comp, src.shape, src.shape, part_shape, src.dtype)
+                np.testing.assert_array_equal(src, dest)
+        except AssertionError as e:
+            results[name] = e
+        else:
+            results[name] = None
+
+    threads = [threading.Thread(target=ingest, args=(i, ps)) for i, ps in enumerate([[4, 4, 4], [16, 16, 16]])]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    # The assertions of the threads do not fail the test by themselves
+
+    assert sorted(results) == [0, 1]
+
+    for e in results.values():
+        if e is not None:
+            raise e
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.float64])
+def test_compress_size(dtype):
+    shape, part_shape = [61, 33, 20], [16, 8, 8]
+
+    src = np.random.RandomState(0).randint(0, 255, size=shape).astype(dtype)
+    src_trans = td.tData(src, part_shape)
+
+    for data, expected in [(src_trans, src), (np.zeros_like(src_trans), np.zeros_like(src))]:
+        comp = td.compress(data, part_shape)
+
+        assert comp.dtype == np.uint8
+        assert comp.nbytes == td.cb2.blosc_cbuffer_sizes(comp)[1]
+        assert comp.nbytes <= data.nbytes + td.BLOSC_MAX_OVERHEAD
+
+        dest = td.decompress_trans(comp, shape, src_trans.shape, part_shape, dtype)
+
+        np.testing.assert_array_equal(expected, dest)
+
+
+def test_file(shapes, tmp_path):
+    shape, part_shape, index = shapes
+
+    key = tuple(slice(None) if index[i] == -1 else index[i] for i in range(len(shape)))
+
+    src = np.arange(np.prod(shape), dtype=np.float32).reshape(shape)
+
+    plan = td.get_plan(shape, part_shape, src.dtype)
+    comp = td.compress(td.tData(src, part_shape, plan=plan), part_shape, plan=plan, codec='lz4', clevel=5)
+
+    path = str(tmp_path / "data.tdata")
+    td.write_file(path, comp, plan, src.dtype, codec='lz4', clevel=5)
+
+    with td.PartitionFile(path) as f:
+        assert f.shape == tuple(shape) and f.dtype == src.dtype
+        assert (f.codec, f.clevel, f.filters) == ('lz4', 5, (td.BLOSC_SHUFFLE,))
+
+        np.testing.assert_array_equal(src[key], f[key])
+        np.testing.assert_array_equal(src[..., ::-2], f[..., ::-2])
+
+        parts = [plan.npart - 1, 0, plan.npart // 2]
+        np.testing.assert_array_equal(td._decompress_parts(comp, plan, parts, src.dtype), f.read_parts(parts))
+
+    with td.PartitionFile(path, nthreads=3, cache=td.PartitionCache(2 ** 20)) as f:
+        for _ in range(2):
+            np.testing.assert_array_equal(src[key], f[key])
+
+    with pytest.raises(ValueError):
+        td.write_file(path, comp, td.get_plan(shape, part_shape, np.float64), np.float64)
+
+    # Table entries outside the file or that do not match their chunk
+
+    nbytes = td.cb2.blosc_cbuffer_sizes(comp)[1]
+
+    entries = [(10 ** 9, nbytes, 0), (4, nbytes, 0), (td.FILE_PREAMBLE.size, nbytes + 1, 0),
+               (td.FILE_PREAMBLE.size + 1, nbytes - 1, 0), (td.FILE_PREAMBLE.size, nbytes, plan.npart)]
+
+    for offset, size, block in entries:
+        td.write_file(path, comp, plan, src.dtype)
+        with open(path, 'r+b') as f:
+            td._write_segment(f, plan, src.dtype, 'blosclz', 9, [td.BLOSC_SHUFFLE], [plan.npart - 1], offset, size,
+                              block)
+        with pytest.raises(ValueError, match="truncated"):
+            td.PartitionFile(path)
+
+    with open(path, 'wb') as f:
+        f.write(b'not a tData file' * 4)
+
+    with pytest.raises(ValueError):
+        td.PartitionFile(path)
+
+
+def test_compress_file(shapes, tmp_path):
+    shape, part_shape, index = shapes
+
+    key = tuple(slice(None) if index[i] == -1 else index[i] for i in range(len(shape)))
+
+    src = np.arange(np.prod(shape), dtype=np.float32).reshape(shape)
+
+    path = str(tmp_path / "data.tdata")
+    td.compress_file(path, src, part_shape, codec='lz4', clevel=5, nthreads=2)
+
+    with td.PartitionFile(path, nthreads=2) as f:
+        assert (f.codec, f.clevel) == ('lz4', 5)
+
+        # One chunk for each row of partitions along the first axis
+
+        assert len(np.unique(f.table['offset'])) == f.plan.nparts[0]
+
+        np.testing.assert_array_equal(src, np.asarray(f))
+        np.testing.assert_array_equal(src[key], f[key])
+
+
+def test_file_save(tmp_path):
+    src = np.random.RandomState(0).rand(40, 30, 20)
+
+    path = str(tmp_path / "data.tdata")
+    td.CompressedPartitionedArray(src, [16, 8, 8]).save(path)
+
+    with td.PartitionFile(path, nthreads=2) as f:
+        np.testing.assert_array_equal(src, np.asarray(f))
+        np.testing.assert_array_equal(src[3:20, 5, ::3], f[3:20, 5, ::3])
+
+
+@pytest.mark.parametrize("shape, part_shape", [([10, 7, 5], [4, 3, 2]), ([8, 13], [4, 5]), ([3, 2, 2, 2], [5, 2, 1, 2])])
+def test_file_append(shape, part_shape, tmp_path):
+    src = np.random.RandomState(0).rand(*shape)
+
+    path = str(tmp_path / "data.tdata")
+    td.CompressedPartitionedArray(src, part_shape).save(path)
+
+    data = [src]
+
+    for n in [1, 2, 0, 7, 3, 4, 9]:
+        with td.PartitionAppender(path) as f:
+            slab = np.random.RandomState(n).rand(n, *shape[1:])
+            f.append(slab)
+            data.append(slab)
+            if n == 3:
+                f.append(slab[0])
+                data.append(slab[:1])
+
+            assert f.shape == (sum(len(d) for d in data),) + tuple(shape[1:])
+
+        expected = np.concatenate(data)
+
+        with td.PartitionFile(path) as f:
+            assert f.shape == expected.shape
+            np.testing.assert_array_equal(expected, np.asarray(f))
+            np.testing.assert_array_equal(expected[-3:, ..., ::2], f[-3:, ..., ::2])
+
+    # Rows appended one by one (only flushed rows are visible)
+
+    with td.PartitionAppender(path) as f:
+        for i in range(5):
+            f.append(expected[i])
+            if i == 2:
+                f.flush()
+                with td.PartitionFile(path) as r:
+                    np.testing.assert_array_equal(np.concatenate([expected, expected[:3]]), np.asarray(r))
+                    assert r.table['offset'][0] == td.FILE_PREAMBLE.size or shape[0] < part_shape[0]
+
+    with td.PartitionFile(path) as r:
+        np.testing.assert_array_equal(np.concatenate([expected, expected[:5]]), np.asarray(r))
+
+    with td.PartitionAppender(path) as f:
+        with pytest.raises(ValueError):
+            f.append(np.zeros([2] + shape[1:], dtype=np.float32))
+        with pytest.raises(ValueError):
+            f.append(np.zeros([2, 1] + shape[2:]))
+
+
+def _file_size(path):
+    """
+    Size of a container file with only the chunks in use and the last segment (as after compact).
+    """
+
+    with td.PartitionFile(path) as f:
+        chunks, first = np.unique(f.table['offset'], return_index=True)
+        with open(path, 'rb') as g:
+            nbytes = td.FILE_PREAMBLE.unpack(g.read(td.FILE_PREAMBLE.size))[2]
+        return (td.FILE_PREAMBLE.size + f.table['nbytes'][first].sum() + nbytes
+                + f.plan.npart * td.FILE_ENTRY_DTYPE.itemsize)
+
+
+def test_file_compact(tmp_path):
+    src = np.random.RandomState(0).rand(20, 200, 100).astype(np.float32)
+    part_shape = [4, 10, 10]
+
+    path = str(tmp_path / "data.tdata")
+    td.CompressedPartitionedArray(src[:8], part_shape).save(path)
+
+    # Each flush only adds a chunk and the entries of its partitions (not the whole table)
+
+    with td.PartitionAppender(path) as f:
+        for i in range(8, 20):
+            size = os.path.getsize(path)
+            f.append(src[i])
+            f.flush()
+
+            with td.PartitionFile(path) as r:
+                growth = os.path.getsize(path) - size - r.table['nbytes'][-1]
+                assert growth <= r.plan.part_strides[0] * td.FILE_ENTRY_DTYPE.itemsize + 1024
+
+    size = os.path.getsize(path)
+
+    td.compact(path)
+
+    assert os.path.getsize(path) == _file_size(path) < size
+
+    with td.PartitionFile(path, nthreads=2) as f:
+        np.testing.assert_array_equal(src, np.asarray(f))
+
+    with td.PartitionAppender(path) as f:
+        f.append(src[:3])
+
+    with td.PartitionFile(path) as f:
+        np.testing.assert_array_equal(np.concatenate([src, src[:3]]), np.asarray(f))
+
+
+def test_write_region(shapes, tmp_path):
+    shape, part_shape, index = shapes
+
+    key = tuple(slice(None) if index[i] == -1 else index[i] for i in range(len(shape)))
+
+    src = np.arange(np.prod(shape), dtype=np.int32).reshape(shape)
+
+    path = str(tmp_path / "data.tdata")
+    td.CompressedPartitionedArray(src, part_shape).save(path)
+
+    with td.PartitionFile(path) as f:
+        table = f.table.copy()
+
+    regions = [(key, -1),
+               ((Ellipsis, slice(None, None, -3)), np.arange(len(range(shape[-1] - 1, -1, -3)))),
+               (tuple(slice(n // 3, n // 2 + 1) for n in shape), 7),
+               ((0,) * len(shape), 9)]
+
+    touched = np.zeros(shape, dtype=bool)
+
+    for k, values in regions:
+        td.write_region(path, k, values)
+        src[k] = values
+        touched[k] = True
+
+    with td.PartitionFile(path) as f:
+        np.testing.assert_array_equal(src, np.asarray(f))
+
+        # Only the touched partitions are moved to new chunks
+
+        plan = f.plan
+        touched = np.pad(touched, [(0, t - n) for t, n in zip(plan.trans_shape, shape)])
+        touched = td.tData(touched, part_shape).reshape(plan.npart, -1).any(axis=1)
+
+        np.testing.assert_array_equal(f.table[~touched], table[~touched])
+        assert np.all(f.table['offset'][touched] != td.FILE_PREAMBLE.size)
+
+    # Each update only adds a chunk and the entries of the touched partitions
+
+    size = os.path.getsize(path)
+    td.write_region(path, (0,) * len(shape), 5)
+    src[(0,) * len(shape)] = 5
+
+    with td.PartitionFile(path) as f:
+        assert os.path.getsize(path) - size <= f.table['nbytes'][0] + td.FILE_ENTRY_DTYPE.itemsize + 1024
+
+    size = os.path.getsize(path)
+    td.compact(path)
+
+    with td.PartitionFile(path) as f:
+        assert os.path.getsize(path) == _file_size(path) < size
+        np.testing.assert_array_equal(src, np.asarray(f))
+
+
+def test_decompress_full(shapes):
+    shape, part_shape, index = shapes
+
+    src = np.arange(np.prod(shape), dtype=np.int64).reshape(shape)
+
+    plan = td.get_plan(shape, part_shape, src.dtype)
+    comp = td.compress(td.tData(src, part_shape, plan=plan), part_shape, plan=plan)
+
+    np.testing.assert_array_equal(src, td.decompress_full(comp, plan, src.dtype, nthreads=3))
+
+    out = np.empty(shape, dtype=src.dtype)
+    assert td.decompress_full(comp, plan, src.dtype, out=out) is out
+    np.testing.assert_array_equal(src, out)
+
+    plan32 = td.get_plan(shape, part_shape, np.float32)
+
+    for f in [lambda: td.decompress_full(comp, plan, np.float32), lambda: td.decompress_full(comp, plan32, src.dtype),
+              lambda: td.decompress_trans(comp, shape, plan.trans_shape, part_shape, np.float32, plan=plan),
+              lambda: td.take_points(comp, plan, [[0] * len(shape)], np.float32),
+              lambda: td.where(comp, plan, td.zone_maps(td.tData(src, part_shape), part_shape), '>', 0, np.float32),
+              lambda: td._decompress_parts(comp, plan, [0], np.int8)]:
+        with pytest.raises(ValueError):
+            f()
+
+    for bad in [np.empty(shape, dtype=np.float64), np.empty(shape[::-1], dtype=src.dtype).T,
+                np.empty([n + 1 for n in shape], dtype=src.dtype), np.broadcast_to(src, shape)]:
+        with pytest.raises(ValueError):
+            td.decompress_full(comp, plan, src.dtype, out=bad)
+
+
+def test_out(shapes):
+    shape, part_shape, index = shapes
+
+    key = tuple(slice(None) if index[i] == -1 else index[i] for i in range(len(shape)))
+
+    pool = td.BufferPool()
+    plan = td.get_plan(shape, part_shape, np.float32)
+
+    for i in range(3):
+        src = np.full(shape, i, dtype=np.float32)
+        src[(0,) * len(shape)] = -i
+
+        src_trans = td.tData(src, part_shape, plan=plan, out=pool.get(plan.trans_shape, src.dtype))
+        cbuf = pool.get(src_trans.nbytes + td.BLOSC_MAX_OVERHEAD, np.uint8)
+        comp = td.compress(src_trans, part_shape, plan=plan, out=cbuf)
+
+        assert np.shares_memory(comp, cbuf)
+
+        full = td.decompress(comp, plan.trans_shape, src.dtype, out=pool.get(plan.trans_shape, src.dtype))
+        np.testing.assert_array_equal(src_trans, full)
+
+        sub = pool.get(src[key].shape, src.dtype)
+        assert td.decompress_trans(comp, shape, plan.trans_shape, part_shape, src.dtype, key, plan=plan,
+                                   out=sub) is sub
+        np.testing.assert_array_equal(src[key], sub)
+
+        for buf in [src_trans, cbuf, full, sub]:
+            pool.put(buf)
+
+    assert len(pool) == 4
+
+    with pytest.raises(ValueError):
+        td.compress(src_trans, part_shape, out=np.empty(src_trans.nbytes, dtype=np.uint8))
+
+    with pytest.raises(ValueError):
+        td.decompress(comp, plan.trans_shape, src.dtype, out=np.empty(plan.trans_shape, dtype=np.float64))
+
+    with pytest.raises(ValueError):
+        td.decompress_trans(comp, shape, plan.trans_shape, part_shape, src.dtype, key, out=np.empty(shape, src.dtype))
+
+    with pytest.raises(ValueError):
+        td.decompress_trans(comp, shape, plan.trans_shape, part_shape, src.dtype, (Ellipsis, slice(None, None, -1)),
+                            out=np.empty(shape, src.dtype))
+
+
+@pytest.mark.parametrize("nthreads", [1, 3])
+def test_tData_strided(shapes, nthreads):
+    shape, part_shape, index = shapes
+
+    base = np.arange(np.prod(shape) * 2, dtype=np.int32).reshape([2] + shape)
+
+    views = [base[1],
+             base[:, ::-1][0],
+             np.asfortranarray(base[0]),
+             base[0][..., ::2],
+             base.transpose()[..., 1].transpose(),
+             np.broadcast_to(base[0][..., :1], shape)]
+
+    for src in views:
+        ps = part_shape[:src.ndim]
+        expected = td.tData(np.ascontiguousarray(src), ps)
+
+        np.testing.assert_array_equal(expected, td.tData(src, ps, nthreads=nthreads))
+
+        # Inverse transformation written in a strided view
+
+        out = np.zeros(src.shape[:-1] + (src.shape[-1] * 2,), dtype=src.dtype)[..., ::2]
+        assert td.tData(expected, ps, inverse=True, shape=src.shape, out=out, nthreads=nthreads) is out
+        np.testing.assert_array_equal(src, out)
+
+    src = base[1].T
+    arr = td.CompressedPartitionedArray(src, part_shape[::-1])
+    np.testing.assert_array_equal(src, np.asarray(arr))
+
+
+@pytest.mark.parametrize("shape", [[0, 5], [4, 0, 3], [0]])
+def test_tData_empty(shape):
+    src = np.zeros(shape, dtype=np.float32)
+    part_shape = [2] * len(shape)
+
+    for nthreads in [1, 4]:
+        dest = td.tData(src, part_shape, nthreads=nthreads)
+        assert dest.size == 0
+
+        np.testing.assert_array_equal(src, td.tData(dest, part_shape, inverse=True, shape=shape, nthreads=nthreads))
+
+
+def test_tData_scalar():
+    src = np.array(5.0)
+
+    with pytest.raises(ValueError):
+        td.tData(src, ())
 
-    np.testing.assert_array_equal(src[slices], dest)
+    with pytest.raises(ValueError):
+        td.CompressedPartitionedArray(src, ())
@@ -2,101 +2,386 @@
 Implements functions to use tData library.
 """
 
+from collections import OrderedDict
+from functools import lru_cache
+import itertools
+import json
+import mmap
+import os
+import struct
+import threading
 import numpy as np
 from tData import ffi, lib
 import pycblosc2 as cb2
 
 
-def tData(src, ps, inverse=False):
+PLAN_CACHE_SIZE = 128
+POINTS_BATCH_NBYTES = 64 * 2 ** 20
+REDUCE_BATCH_NBYTES = 16 * 2 ** 20
+
+FILE_MAGIC = b'tData\x00\x02\x00'
+FILE_PREAMBLE = struct.Struct('<8sQQ')
+FILE_TABLE_DTYPE = np.dtype([('offset', '<i8'), ('nbytes', '<i8'), ('block', '<i8')])
+FILE_ENTRY_DTYPE = np.dtype([('part', '<i8'), ('offset', '<i8'), ('nbytes', '<i8'), ('block', '<i8')])
+FILE_COPY_NBYTES = 16 * 2 ** 20
+
+BLOSC_MAX_OVERHEAD = 32
+BLOSC_MIN_HEADER_LENGTH = 16
+BLOSC_MAX_FILTERS = 5
+BLOSC_NOSHUFFLE = 0
+BLOSC_SHUFFLE = 1
+BLOSC_BITSHUFFLE = 2
+
+
+class TransformPlan:
+    """
+    Parameters of the transformation of a data shape, calculated once.
+
+    Parameters
+    ----------
+    shape: int[] or tuple
+        Original data shape.
+    part_shape: int[] or tuple
+        Data partition shape.
+    dtype: np.dtype
+        Data type (only its item size is used).
+
+    Attributes
+    ----------
+    trans_shape: tuple
+        Partitioned (padded) data shape.
+    nparts: tuple
+        Number of partitions along each axis.
+    npart: int
+        Total number of partitions.
+    strides: tuple
+        Strides (in elements) of the original data.
+    part_strides: tuple
+        Strides of the partition grid. The chunk number of the partition with coordinates pc is
+        sum(pc * part_strides).
+    part_size, part_nbytes: int
+        Partition size in elements and in bytes (the scratch buffer size of a partition).
+    """
+
+    def __init__(self, shape, part_shape, dtype):
+
+        if len(shape) != len(part_shape):
+            raise ValueError("shape and part_shape must have the same dimension")
+
+        # The C functions walk the last axis of the data, so there must be one
+
+        if len(shape) == 0:
+            raise ValueError("the data must have at least one dimension")
+
+        self.shape = tuple(int(n) for n in shape)
+        self.part_shape = tuple(int(n) for n in part_shape)
+        self.typesize = np.dtype(dtype).itemsize
+        self.dimension = len(self.shape)
+
+        # Calculate the extended dataset parameters
+
+        self.nparts = tuple(-(-n // p) for n, p in zip(self.shape, self.part_shape))
+        self.trans_shape = tuple(n * p for n, p in zip(self.nparts, self.part_shape))
+        self.npart = int(np.prod(self.nparts))
+        self.size = int(np.prod(self.trans_shape))
+        self.part_size = int(np.prod(self.part_shape))
+        self.part_nbytes = self.part_size * self.typesize
+
+        # Calculate the strides of the data and of the partition grid
+
+        strides = [1] * self.dimension
+        part_strides = [1] * self.dimension
+
+        for i in range(self.dimension - 2, -1, -1):
+            strides[i] = strides[i + 1] * self.shape[i + 1]
+            part_strides[i] = part_strides[i + 1] * self.nparts[i + 1]
+
+        self.strides = tuple(strides)
+        self.part_strides = tuple(part_strides)
+
+        # Arrays passed to the C functions
+
+        self.c_shape = ffi.new("int[]", self.shape)
+        self.c_trans_shape = ffi.new("int[]", self.trans_shape)
+        self.c_part_shape = ffi.new("int[]", self.part_shape)
+
+    def __repr__(self):
+        return "TransformPlan(shape={}, part_shape={}, typesize={})".format(self.shape, self.part_shape,
+                                                                           self.typesize)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _get_plan(shape, part_shape, typesize):
+    return TransformPlan(shape, part_shape, "V{}".format(typesize))
+
+
+def get_plan(shape, part_shape, dtype):
+    """
+    Obtain the transformation plan of a data shape from a LRU cache.
+
+    Parameters
+    ----------
+    shape: int[] or tuple
+        Original data shape.
+    part_shape: int[] or tuple
+        Data partition shape.
+    dtype: np.dtype
+        Data type.
+
+    Returns
+    -------
+    plan: TransformPlan
+        Plan shared by all the calls with the same shape, part_shape and item size.
+    """
+
+    return _get_plan(tuple(int(n) for n in shape), tuple(int(n) for n in part_shape),
+                     np.dtype(dtype).itemsize)
+
+
+def _check_plan(plan, shape, typesize):
+    if plan.shape != tuple(shape) or plan.typesize != typesize:
+        raise ValueError("{!r} does not match shape {} and typesize {}".format(plan, tuple(shape),
+                                                                              typesize))
+
+
+def _check_typesize(plan, dtype):
+    if plan.typesize != np.dtype(dtype).itemsize:
+        raise ValueError("{!r} does not match dtype {}".format(plan, np.dtype(dtype)))
+
+
+def _check_out(out, shape, dtype, contiguous=True):
+    if out.shape != tuple(shape) or out.dtype != np.dtype(dtype) or not out.flags.writeable \
+            or (contiguous and not out.flags.c_contiguous):
+        raise ValueError("out must be a writeable {}array with shape {} and dtype {}".format(
+            "C contiguous " if contiguous else "", tuple(shape), np.dtype(dtype)))
+
+
+def _strided_buffer(a):
+    """
+    Buffer of an array and its strides in bytes (NULL if it is C contiguous).
+    """
+
+    if a.flags.c_contiguous:
+        return ffi.from_buffer(a, require_writable=False), ffi.NULL
+
+    return ffi.cast("char *", a.ctypes.data), ffi.new("int64_t[]", a.strides)
+
+
+def tData(src, ps, inverse=False, fill=0, nthreads=1, plan=None, shape=None, out=None):
     """
     Apply a data transformation based in reorganize data partitions.
 
     Parameters
     ----------
     src : np.array
-        Data to transform.
+        Data to transform. The original data can be any strided view (sliced, transposed or in
+        Fortran order), it is read in place without copying it.
     ps: int[] or tuple
         Data partition shape.
     inverse: bool, optional
+    fill: scalar, optional
+        Value used to pad the partitions that are outside the data.
+    nthreads: int, optional
+        Number of threads used to transform the partitions.
+    plan: TransformPlan, optional
+        Plan of the original data shape (obtained from the cache if it is not given).
+    shape: int[] or tuple, optional
+        Original data shape (inverse only). The padding is cropped, so only the elements inside it
+        are written. By default it is src shape.
+    out: np.array, optional
+        Array where the result is written (with the result shape and src dtype). It must be C
+        contiguous, except in the inverse transformation, where it can be any strided view.
 
     Returns
     -------
     dest: np.array
-        Data transformed.
-    d: dict
-        Dictionary with partitions indexation.
+        Data transformed (out if it is given).
     """
 
-    # Obtain src parameters
+    if not inverse:
+        if shape is not None:
+            raise ValueError("shape is only used by the inverse transformation")
+        if plan is None:
+            plan = get_plan(src.shape, ps, src.dtype)
+        else:
+            _check_plan(plan, src.shape, src.dtype.itemsize)
+        dest_shape = plan.trans_shape
+    else:
+        if plan is None:
+            plan = get_plan(src.shape if shape is None else shape, ps, src.dtype)
+        elif shape is not None:
+            _check_plan(plan, shape, src.dtype.itemsize)
+        if src.size != plan.size or not src.flags.c_contiguous:
+            raise ValueError("src must be the C contiguous transformation of {!r}".format(plan))
+        dest_shape = plan.shape
 
-    typesize = src.dtype.itemsize
-    shape = src.shape
-    dimension = len(shape)
+    # Create destination dataset
 
-    # Calculate the extended dataset parameters
+    if out is None:
+        dest = np.empty(dest_shape, dtype=src.dtype)
+    else:
+        _check_out(out, dest_shape, src.dtype, contiguous=not inverse)
+        dest = out
 
-    ts = []
+    # Transform datasets to buffers (for use in cffi). The original data is accessed through its
+    # strides, so views are not copied
 
-    for i in range(len(shape)):
-        d = shape[i]
-        if shape[i] % ps[i] != 0:
-            d = shape[i] + ps[i] - shape[i] % ps[i]
-        ts.append(d)
+    if inverse:
+        src_b = ffi.from_buffer(src, require_writable=False)
+        dest_b, strides = _strided_buffer(dest)
+    else:
+        src_b, strides = _strided_buffer(src)
+        dest_b = ffi.from_buffer(dest)
 
-    size = np.prod(ts)
+    fill_b = ffi.NULL if fill == 0 else ffi.from_buffer(np.array(fill, dtype=src.dtype))
 
-    # Create destination dataset
+    # Execute the transformation (padding is done in the same pass and the GIL is released by cffi)
 
-    dest = np.empty(size, dtype=src.dtype).reshape(ts)
+    inv = 1 if inverse else 0
 
-    # Transform datasets to buffers (for use in cffi)
+    lib.tData_part(src_b, dest_b, plan.typesize, plan.c_shape, strides, plan.c_part_shape, plan.dimension, inv,
+                   fill_b, nthreads)
 
-    src_b = ffi.from_buffer(src)
-    dest_b = ffi.from_buffer(dest)
+    return dest
 
-    # Execute the transformation
 
-    inv = 1 if inverse else 0
+# Compression/decompression functions
 
-    lib.tData(src_b, dest_b, typesize, shape, ts, ps, size, dimension, inv)
 
-    return dest
+def zone_maps(src, ps):
+    """
+    Calculate the zone maps of transformed data (one entry per partition).
+
+    Parameters
+    ----------
+    src : np.array
+        Data transformed.
+    ps: int[] or tuple
+        Data partition shape.
+
+    Returns
+    -------
+    zm : np.array
+        Structured array with the minimum and the maximum (NaN are ignored), the number of NaN
+        and the all-zero and constant flags (without NaN) of each partition. The padding cells are
+        included, so the ranges are conservative.
+    """
 
+    parts = src.reshape(-1, int(np.prod(ps)))
 
-# Compression/decompression functions
+    zm = np.empty(len(parts), dtype=[('min', src.dtype), ('max', src.dtype), ('nan', np.int64), ('zero', bool),
+                                     ('constant', bool)])
+
+    zm['min'] = np.fmin.reduce(parts, axis=1)
+    zm['max'] = np.fmax.reduce(parts, axis=1)
+    zm['nan'] = np.isnan(parts).sum(axis=1) if src.dtype.kind in 'fc' else 0
+    zm['zero'] = (zm['min'] == 0) & (zm['max'] == 0) & (zm['nan'] == 0)
+    zm['constant'] = (zm['min'] == zm['max']) & (zm['nan'] == 0)
 
+    return zm
 
-def compress(src, ps):
+
+def compress(src, ps, plan=None, zonemap=False, codec='blosclz', clevel=9, filters=(BLOSC_SHUFFLE,), nthreads=1,
+             out=None):
     """
     Compress data.
 
+    The compression parameters are passed through a context created for this call, so several
+    threads can compress at the same time with different parameters (the block size of the
+    partitions is not set in the global state of Blosc).
+
     Parameters
     ----------
     src : np.array
         Data to compress.
     ps: int[] or tuple
         Data partition shape.
+    plan: TransformPlan, optional
+        Plan of the data (only its partition size is used).
+    zonemap: bool, optional
+        Also calculate the zone maps of the partitions (src must be transformed data).
+    codec: str or int, optional
+        Compressor name ('blosclz', 'lz4', 'lz4hc', 'zlib', 'zstd', ...) or code.
+    clevel: int, optional
+        Compression level (0-9).
+    filters: int[] or tuple, optional
+        Filters applied in order (BLOSC_SHUFFLE or BLOSC_BITSHUFFLE), at most BLOSC_MAX_FILTERS.
+        The delta filter is not supported, because its blocks can not be decompressed one by one.
+    nthreads: int, optional
+        Number of threads used by Blosc.
+    out: np.array, optional
+        C contiguous np.uint8 array of at least src.nbytes + BLOSC_MAX_OVERHEAD elements where the
+        data is compressed.
 
     Returns
     -------
     dest : chunk
-        Data compressed.
+        Data compressed (np.uint8 array with the exact size of the chunk, a view of out if it is
+        given). If the data does not compress, Blosc stores it without compression.
+    zm : np.array
+        Zone maps of the partitions (only if zonemap is True).
     """
 
+    # Blosc needs a contiguous buffer (the output of tData always is)
+
+    src = np.ascontiguousarray(src)
+
     size = src.size
     itemsize = src.dtype.itemsize
     bsize = size * itemsize
 
-    dest = np.empty(size, dtype=src.dtype)
+    part_nbytes = plan.part_nbytes if plan is not None else int(np.prod(ps)) * itemsize
+
+    if len(filters) > BLOSC_MAX_FILTERS:
+        raise ValueError("at most {} filters are supported".format(BLOSC_MAX_FILTERS))
+    if any(f not in (BLOSC_NOSHUFFLE, BLOSC_SHUFFLE, BLOSC_BITSHUFFLE) for f in filters):
+        raise ValueError("unsupported filters {!r}".format(filters))
+
+    compcode = cb2.blosc_compname_to_compcode(codec) if isinstance(codec, str) else codec
+    if compcode < 0:
+        raise ValueError("unknown codec {!r}".format(codec))
+
+    # The last filters are applied last
 
-    cb2.blosc_set_blocksize(np.prod(ps) * itemsize)
+    filters = [BLOSC_NOSHUFFLE] * (BLOSC_MAX_FILTERS - len(filters)) + list(filters)
 
-    cb2.blosc_compress(9, 1, itemsize, bsize, src, dest, bsize)
+    cparams = cb2.blosc2_create_cparams(compcode=compcode, clevel=clevel, use_dict=0, typesize=itemsize,
+                                        nthreads=nthreads, blocksize=part_nbytes, schunk=None,
+                                        filters=filters,
+                                        filters_meta=[0] * BLOSC_MAX_FILTERS)
+
+    # With room for the overhead Blosc always succeeds (the chunk is copied if it does not compress)
+
+    if out is None:
+        dest = np.empty(bsize + BLOSC_MAX_OVERHEAD, dtype=np.uint8)
+    elif out.dtype != np.uint8 or out.ndim != 1 or out.size < bsize + BLOSC_MAX_OVERHEAD \
+            or not out.flags.c_contiguous or not out.flags.writeable:
+        raise ValueError("out must be a writeable C contiguous np.uint8 array with at least {} elements".format(
+            bsize + BLOSC_MAX_OVERHEAD))
+    else:
+        dest = out
+
+    cctx = cb2.blosc2_create_cctx(cparams)
+    try:
+        csize = cb2.blosc2_compress_ctx(cctx, bsize, src, dest, dest.size)
+    finally:
+        cb2.blosc2_free_ctx(cctx)
+
+    if csize <= 0:
+        raise RuntimeError("Blosc could not compress the data (error {})".format(csize))
+
+    if out is None:
+        dest.resize(csize, refcheck=False)
+    else:
+        dest = out[:csize]
+
+    if zonemap:
+        return dest, zone_maps(src, ps)
 
     return dest
 
 
-def decompress(comp, s, dtype):
+def decompress(comp, s, dtype, out=None):
     """
     Decompress data.
 
@@ -110,27 +395,336 @@ def decompress(comp, s, dtype):
         Data item size.
     dtype: np.type
         Data type.
+    out: np.array, optional
+        Array where the data is decompressed (C contiguous, with shape s and dtype).
 
     Returns
     -------
     dest : np.array
-        Data decompressed.
+        Data decompressed (out if it is given).
     """
 
     size = np.prod(s)
-    bsize = size * dtype.itemsize
+    bsize = size * np.dtype(dtype).itemsize
 
-    dest = np.empty(size, dtype=dtype).reshape(s)
+    if out is None:
+        dest = np.empty(size, dtype=dtype).reshape(s)
+    else:
+        _check_out(out, s, dtype)
+        dest = out
 
     cb2.blosc_decompress(comp, dest, bsize)
 
     return dest
 
 
-def decompress_trans(comp, s, ts, ps, dtype, a=-1, b=-1, c=-1, d=-1, e=-1, f=-1, g=-1, h=-1):
+# Decompressed partitions cache
+
+
+class PartitionCache:
+    """
+    LRU cache of decompressed partitions with a budget in bytes, shared across queries.
+
+    Parameters
+    ----------
+    nbytes: int
+        Maximum size (in bytes) of the cached partitions.
+
+    Attributes
+    ----------
+    hits, misses, evictions: int
+        Counters of the cache lookups and of the partitions discarded to respect the budget.
+    """
+
+    def __init__(self, nbytes):
+        self.max_nbytes = nbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._parts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._parts)
+
+    def get(self, dataset, n):
+        """
+        Return the partition n of a dataset (or None if it is not cached).
+        """
+
+        with self._lock:
+            part = self._parts.get((dataset, n))
+            if part is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._parts.move_to_end((dataset, n))
+            return part
+
+    def put(self, dataset, n, part):
+        """
+        Insert the partition n of a dataset, evicting the least recently used ones if needed.
+        """
+
+        if part.nbytes > self.max_nbytes:
+            return
+
+        part.setflags(write=False)
+
+        with self._lock:
+            old = self._parts.pop((dataset, n), None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._parts[(dataset, n)] = part
+            self.nbytes += part.nbytes
+            while self.nbytes > self.max_nbytes:
+                _, old = self._parts.popitem(last=False)
+                self.nbytes -= old.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._parts.clear()
+            self.nbytes = 0
+
+
+class BufferPool:
+    """
+    Pool of arrays reused by repeated calls with the same shapes (passed as out).
+
+    Parameters
+    ----------
+    max_buffers: int, optional
+        Maximum number of free arrays kept for each shape and dtype.
+    """
+
+    def __init__(self, max_buffers=4):
+        self.max_buffers = max_buffers
+        self._free = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(b) for b in self._free.values())
+
+    def get(self, shape, dtype):
+        """
+        Take an array from the pool (a new one is created if there is no free one).
+        """
+
+        key = (tuple(int(n) for n in np.atleast_1d(shape)), np.dtype(dtype))
+
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+
+        return np.empty(key[0], dtype=key[1])
+
+    def put(self, buf):
+        """
+        Give back an array taken with get (the results that are views of it must not be used
+        anymore).
+        """
+
+        key = (buf.shape, buf.dtype)
+
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_buffers:
+                free.append(buf)
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+
+
+def _table_buffers(table):
+    """
+    Buffers with the chunk offset and block of each partition (NULL if there is no table).
+    """
+
+    if table is None:
+        return ffi.NULL, ffi.NULL
+
+    offsets, blocks = table
+
+    return ffi.from_buffer("int64_t[]", offsets), ffi.from_buffer("int64_t[]", blocks)
+
+
+def _decompress_parts(comp, plan, parts, dtype, nthreads=1, table=None):
+    """
+    Decompress a list of partitions in an array with one row per partition.
+    """
+
+    _check_typesize(plan, dtype)
+
+    parts = np.ascontiguousarray(parts, dtype=np.int64)
+    dest = np.empty((len(parts), plan.part_size), dtype=dtype)
+
+    if len(parts) == 0:
+        return dest
+
+    rc = lib.decompress_parts(ffi.from_buffer(comp), ffi.from_buffer(dest), ffi.from_buffer("int64_t[]", parts),
+                              len(parts), plan.part_size, plan.typesize, *_table_buffers(table), nthreads)
+
+    if rc < 0:
+        raise RuntimeError("Blosc could not decompress the data partitions")
+
+    return dest
+
+
+def _intersection(plan, pc, start, stop, step):
+    """
+    Intersect the partition with coordinates pc and a hyper-rectangle.
+
+    Returns
+    -------
+    src, dest: tuple of slices
+        Selected elements inside the partition and their position in the result (None if the
+        partition does not contain any selected element).
+    """
+
+    src, dest = [], []
+
+    for i in range(plan.dimension):
+        lo = pc[i] * plan.part_shape[i]
+        hi = lo + plan.part_shape[i]
+        k0 = -(-(max(start[i], lo) - start[i]) // step[i])
+        k1 = -(-(min(stop[i], hi) - start[i]) // step[i])
+        if k1 <= k0:
+            return None, None
+        first = start[i] + k0 * step[i] - lo
+        src.append(slice(first, first + (k1 - k0 - 1) * step[i] + 1, step[i]))
+        dest.append(slice(k0, k1))
+
+    return tuple(src), tuple(dest)
+
+
+def _touched_parts(plan, start, stop):
+    """
+    Coordinates and chunk numbers of the partitions that intersect a hyper-rectangle.
+    """
+
+    ranges = [np.arange(start[i] // plan.part_shape[i], (stop[i] - 1) // plan.part_shape[i] + 1)
+              for i in range(plan.dimension)]
+
+    coords = np.stack([g.ravel() for g in np.meshgrid(*ranges, indexing='ij')], axis=1)
+    parts = coords @ np.array(plan.part_strides, dtype=np.int64)
+
+    return coords, parts
+
+
+def _touched_intersections(plan, start, stop, step):
+    """
+    Chunk numbers and intersections (see _intersection) of the partitions with selected elements.
+    """
+
+    for pc, n in zip(*_touched_parts(plan, start, stop)):
+        src_sl, dest_sl = _intersection(plan, pc, start, stop, step)
+        if src_sl is not None:
+            yield n, src_sl, dest_sl
+
+
+def _drop_and_flip(dest, fs, drop, flip):
+    """
+    Remove the axes indexed with an integer and reverse the ones with a negative step.
+    """
+
+    dest = dest.reshape([fs[i] for i in range(len(fs)) if i not in drop])
+
+    if flip:
+        axes = [i - sum(j < i for j in drop) for i in flip]
+        dest = dest[tuple(slice(None, None, -1) if i in axes else slice(None) for i in range(dest.ndim))]
+
+    return dest
+
+
+def _expand_key(key, dimension):
+    """
+    Expand an indexing key to one entry per axis (boolean arrays are replaced by the integer
+    arrays of their nonzero positions and the ellipsis by full slices).
+    """
+
+    if not isinstance(key, tuple):
+        key = (key,)
+
+    expanded = []
+
+    for k in key:
+        if isinstance(k, (list, np.ndarray)) and np.asarray(k).dtype == bool:
+            expanded.extend(np.nonzero(k))
+        else:
+            expanded.append(k)
+
+    key = tuple(expanded)
+
+    # Expand the ellipsis
+
+    ellipsis = [i for i, k in enumerate(key) if k is Ellipsis]
+
+    if len(ellipsis) > 1:
+        raise IndexError("an index can only have a single ellipsis ('...')")
+
+    if ellipsis:
+        i = ellipsis[0]
+        key = key[:i] + (slice(None),) * (dimension - len(key) + 1) + key[i + 1:]
+
+    if len(key) > dimension:
+        raise IndexError("too many indices: data is {}-dimensional".format(dimension))
+
+    return key + (slice(None),) * (dimension - len(key))
+
+
+def _parse_key(key, shape):
+    """
+    Normalize an indexing key (integers, slices and an ellipsis) of data with a shape.
+
+    Returns
+    -------
+    start, stop, step: int[]
+        Selected hyper-rectangle along each axis (with step > 0).
+    drop: int[]
+        Axes indexed with an integer (removed from the result).
+    flip: int[]
+        Axes indexed with a negative step (reversed in the result).
+    """
+
+    key = _expand_key(key, len(shape))
+
+    start, stop, step, drop, flip = [], [], [], [], []
+
+    for i, k in enumerate(key):
+        if isinstance(k, slice):
+            a, b, c = k.indices(shape[i])
+            r = range(a, b, c)
+            if len(r) == 0:
+                a, b, c = 0, 0, 1
+            elif c < 0:
+                a, b, c = r[-1], r[0] + 1, -c
+                flip.append(i)
+        else:
+            a = int(k)
+            if a < 0:
+                a += shape[i]
+            if not 0 <= a < shape[i]:
+                raise IndexError("index {} is out of bounds for axis {} with size {}".format(k, i, shape[i]))
+            b, c = a + 1, 1
+            drop.append(i)
+        start.append(a)
+        stop.append(b)
+        step.append(c)
+
+    return start, stop, step, drop, flip
+
+
+def decompress_trans(comp, s, ts, ps, dtype, key=(), nthreads=1, plan=None, cache=None, dataset=None,
+                     table=None, out=None):
     """
     Decompress partitioned data.
 
+    Only the partitions that intersect the desired data are decompressed.
+
     Parameters
     ----------
     comp : chunk
@@ -141,35 +735,1121 @@ def decompress_trans(comp, s, ts, ps, dtype, a=-1, b=-1, c=-1, d=-1, e=-1, f=-1,
         Partitioned data shape.
     ps: int[] or tuple
         Data partition shape.
-    a, b, c, d, e, f, g, h: int, optional
-        Defines the subset of data desired
+    dtype: np.dtype
+        Data type.
+    key: tuple, optional
+        Defines the subset of data desired (integers, slices and an ellipsis, as in NumPy).
+    nthreads: int, optional
+        Number of threads used to decompress the partitions (each one with its own Blosc context).
+    plan: TransformPlan, optional
+        Plan of the original data (obtained from the cache if it is not given).
+    cache: PartitionCache, optional
+        Cache of decompressed partitions. The partitions found in it are not decompressed again.
+    dataset: hashable, optional
+        Identifier of comp inside the cache (required if cache is given).
+    table: tuple of np.array, optional
+        Offset from comp of the chunk of each partition and block of the partition inside it
+        (int64 contiguous arrays), when comp holds several chunks (see PartitionFile).
+    out: np.array, optional
+        Array where the data is decompressed (C contiguous, with the shape of the result and
+        dtype). It can not be used with negative steps.
 
     Returns
     -------
     dest : np.array
-     Data decompressed.
+     Data decompressed (out if it is given).
     """
 
-    dimension = len(ps)
-    dim = [a, b, c, d, e, f, g, h][:dimension]
-    b_size = np.prod(ps)
+    if plan is None:
+        plan = get_plan(s, ps, dtype)
+    else:
+        _check_typesize(plan, dtype)
+
+    start, stop, step, drop, flip = _parse_key(key, plan.shape)
 
     # Calculate desired data shape
 
-    fs = [1] * dimension
+    fs = [len(range(start[i], stop[i], step[i])) for i in range(plan.dimension)]
 
-    for i in range(dimension):
-        if dim[i] != -1:
-            fs[i] = 1
-        else:
-            fs[i] = s[i]
+    if out is None:
+        dest = np.empty(fs, dtype=dtype)
+    else:
+        _check_out(out, [fs[i] for i in range(plan.dimension) if i not in drop], dtype)
+        if flip:
+            raise ValueError("out can not be used with negative steps")
+        dest = out.reshape(fs)
 
-    dest = np.empty(np.prod(fs), dtype=dtype).reshape(fs)
+    if cache is None:
 
-    dest_b = ffi.from_buffer(dest)
-    comp_b = ffi.from_buffer(comp)
+        dest_b = ffi.from_buffer(dest)
+        comp_b = ffi.from_buffer(comp)
 
-    lib.decompress_trans(comp_b, dest_b, s, ts, ps, fs, dim, dimension, b_size,
-                         dest.dtype.itemsize)
+        rc = lib.decompress_trans(comp_b, dest_b, plan.c_shape, plan.c_trans_shape, plan.c_part_shape, start,
+                                  stop, step, plan.dimension, plan.part_size, plan.typesize, *_table_buffers(table),
+                                  nthreads)
 
-    return dest
+        if rc < 0:
+            raise RuntimeError("Blosc could not decompress the data partitions")
+
+    elif dest.size > 0:
+
+        if dataset is None:
+            raise ValueError("a dataset identifier is needed to use the partitions cache")
+
+        # Look up the touched partitions and decompress the missing ones
+
+        touched = [(n, src_sl, dest_sl, cache.get(dataset, n))
+                   for n, src_sl, dest_sl in _touched_intersections(plan, start, stop, step)]
+
+        missing = [(n, src_sl, dest_sl) for n, src_sl, dest_sl, part in touched if part is None]
+
+        # Copy the intersection of each cached partition
+
+        for n, src_sl, dest_sl, part in touched:
+            if part is not None:
+                dest[dest_sl] = part.reshape(plan.part_shape)[src_sl]
+
+        # Decompress the missing ones in batches of bounded size (each one is cached in its own array)
+
+        batch = max(nthreads, POINTS_BATCH_NBYTES // plan.part_nbytes)
+
+        for b0 in range(0, len(missing), batch):
+            bmissing = missing[b0:b0 + batch]
+            buf = _decompress_parts(comp, plan, [n for n, _, _ in bmissing], dtype, nthreads, table)
+
+            for part, (n, src_sl, dest_sl) in zip(buf, bmissing):
+                dest[dest_sl] = part.reshape(plan.part_shape)[src_sl]
+                cache.put(dataset, n, part.copy())
+
+    if out is not None:
+        return out
+
+    return _drop_and_flip(dest, fs, drop, flip)
+
+
+def decompress_full(comp, plan, dtype, out=None, nthreads=1, table=None):
+    """
+    Decompress all the partitioned data in its original layout.
+
+    Each partition is decompressed and copied straight to its position in the result, without the
+    padding (no intermediate partitioned array nor inverse transformation are needed).
+
+    Parameters
+    ----------
+    comp : chunk
+        Data compressed.
+    plan: TransformPlan
+        Plan of the original data.
+    dtype: np.dtype
+        Data type.
+    out: np.array, optional
+        Array where the data is decompressed (C contiguous, with the original shape and dtype).
+    nthreads: int, optional
+        Number of threads used to decompress the partitions.
+    table: tuple of np.array, optional
+        Chunk offset and block of each partition (see decompress_trans).
+
+    Returns
+    -------
+    dest : np.array
+        Data decompressed (out if it is given).
+    """
+
+    _check_typesize(plan, dtype)
+
+    if out is None:
+        out = np.empty(plan.shape, dtype=dtype)
+    else:
+        _check_out(out, plan.shape, dtype)
+
+    if out.size == 0:
+        return out
+
+    rc = lib.decompress_trans(ffi.from_buffer(comp), ffi.from_buffer(out), plan.c_shape, plan.c_trans_shape,
+                              plan.c_part_shape, [0] * plan.dimension, list(plan.shape), [1] * plan.dimension,
+                              plan.dimension, plan.part_size, plan.typesize, *_table_buffers(table), nthreads)
+
+    if rc < 0:
+        raise RuntimeError("Blosc could not decompress the data partitions")
+
+    return out
+
+
+def take_points(comp, plan, coords, dtype, nthreads=1):
+    """
+    Obtain the values of partitioned data at a list of coordinates.
+
+    The coordinates are grouped by partition, so each touched partition (one Blosc block) is
+    decompressed only once, and the values are gathered in a vectorized way.
+
+    Parameters
+    ----------
+    comp : chunk
+        Data compressed.
+    plan: TransformPlan
+        Plan of the original data.
+    coords: np.array
+        Coordinates of the points, with shape (N, dimension). Negative values count from the end.
+    dtype: np.dtype
+        Data type.
+    nthreads: int, optional
+        Number of threads used to decompress the partitions.
+
+    Returns
+    -------
+    dest: np.array
+        Values at the N points.
+    """
+
+    _check_typesize(plan, dtype)
+
+    coords = np.array(coords, dtype=np.int64, ndmin=2)
+    shape = np.array(plan.shape, dtype=np.int64)
+    part_shape = np.array(plan.part_shape, dtype=np.int64)
+
+    if coords.ndim != 2 or coords.shape[1] != plan.dimension:
+        raise ValueError("coords must have shape (N, {})".format(plan.dimension))
+
+    coords = np.where(coords < 0, coords + shape, coords)
+
+    if np.any((coords < 0) | (coords >= shape)):
+        raise IndexError("point coordinates are out of bounds for shape {}".format(plan.shape))
+
+    # Partition of each point and position inside it
+
+    inner_strides = np.cumprod((plan.part_shape[1:] + (1,))[::-1])[::-1]
+
+    parts = (coords // part_shape) @ np.array(plan.part_strides, dtype=np.int64)
+    offsets = (coords % part_shape) @ inner_strides
+
+    # Group the points by partition
+
+    uparts, group = np.unique(parts, return_inverse=True)
+    group = group.ravel()
+    order = np.argsort(group, kind='stable')
+    bounds = np.searchsorted(group[order], np.arange(len(uparts) + 1))
+
+    dest = np.empty(len(coords), dtype=dtype)
+
+    # Decompress the touched partitions in batches and gather the values
+
+    batch = max(1, POINTS_BATCH_NBYTES // plan.part_nbytes)
+
+    for u0 in range(0, len(uparts), batch):
+        u1 = min(u0 + batch, len(uparts))
+        buf = _decompress_parts(comp, plan, uparts[u0:u1], dtype, nthreads)
+        sel = order[bounds[u0]:bounds[u1]]
+        dest[sel] = buf[group[sel] - u0, offsets[sel]]
+
+    return dest
+
+
+_CANDIDATES = {
+    '>': lambda zm, v: zm['max'] > v,
+    '>=': lambda zm, v: zm['max'] >= v,
+    '<': lambda zm, v: zm['min'] < v,
+    '<=': lambda zm, v: zm['min'] <= v,
+    '==': lambda zm, v: (zm['min'] <= v) & (v <= zm['max']),
+    '!=': lambda zm, v: ~(zm['constant'] & (zm['min'] == v)),  # NaN != v, so partitions with NaN are not constant
+}
+
+_OPERATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+
+def where(comp, plan, zm, op, value, dtype, nthreads=1):
+    """
+    Obtain the coordinates of the elements that satisfy a predicate.
+
+    The zone maps are used to skip the partitions that cannot contain any matching element.
+
+    Parameters
+    ----------
+    comp : chunk
+        Data compressed.
+    plan: TransformPlan
+        Plan of the original data.
+    zm: np.array
+        Zone maps of the partitions (see zone_maps).
+    op: str
+        Comparison operator ('>', '>=', '<', '<=', '==' or '!=').
+    value: scalar
+        Value compared with the elements.
+    dtype: np.dtype
+        Data type.
+    nthreads: int, optional
+        Number of threads used to decompress the partitions.
+
+    Returns
+    -------
+    coords : np.array
+        Coordinates of the matching elements with shape (M, dimension), in C order (as
+        np.argwhere).
+    """
+
+    _check_typesize(plan, dtype)
+
+    if op not in _OPERATORS:
+        raise ValueError("unknown operator {!r}".format(op))
+
+    parts = np.nonzero(_CANDIDATES[op](zm, value))[0]
+
+    shape = np.array(plan.shape, dtype=np.int64)
+    part_shape = np.array(plan.part_shape, dtype=np.int64)
+    coords = [np.empty((0, plan.dimension), dtype=np.int64)]
+
+    batch = max(nthreads, REDUCE_BATCH_NBYTES // plan.part_nbytes)
+
+    for p0 in range(0, len(parts), batch):
+        bparts = parts[p0:p0 + batch]
+        buf = _decompress_parts(comp, plan, bparts, dtype, nthreads)
+
+        rows, offsets = np.nonzero(_OPERATORS[op](buf, value))
+
+        # Global coordinates of the matching elements (without the padding cells)
+
+        pc = np.stack(np.unravel_index(bparts[rows], plan.nparts), axis=1)
+        inner = np.stack(np.unravel_index(offsets, plan.part_shape), axis=1)
+        c = pc * part_shape + inner
+
+        coords.append(c[np.all(c < shape, axis=1)])
+
+    coords = np.concatenate(coords)
+
+    return coords[np.lexsort(coords.T[::-1])]
+
+
+# Compressed partitioned arrays
+
+
+def _is_array_index(k):
+    return isinstance(k, list) or (isinstance(k, np.ndarray) and k.ndim > 0)
+
+
+class CompressedPartitionedArray:
+    """
+    Compressed partitioned data that can be indexed like a NumPy array.
+
+    Each indexing call only decompresses the partitions that intersect the desired data.
+
+    Parameters
+    ----------
+    src : np.array
+        Data to compress.
+    ps: int[] or tuple
+        Data partition shape.
+    nthreads: int, optional
+        Number of threads used to transform and decompress the data.
+    cache: PartitionCache, optional
+        Cache of decompressed partitions shared by the indexing calls.
+
+    Attributes
+    ----------
+    shape, dtype, ndim, size: as in NumPy
+    nbytes: int
+        Size of the original data in bytes.
+    cbytes: int
+        Size of the compressed data in bytes.
+    plan: TransformPlan
+        Plan of the data.
+    comp: chunk
+        Data compressed.
+    zonemap: np.array
+        Zone maps of the partitions.
+    """
+
+    _ids = itertools.count()
+
+    def __init__(self, src, ps, nthreads=1, cache=None):
+        self.plan = get_plan(src.shape, ps, src.dtype)
+        self.dtype = src.dtype
+        self.nthreads = nthreads
+        self.cache = cache
+        self.comp, self.zonemap = compress(tData(src, ps, nthreads=nthreads, plan=self.plan), ps, plan=self.plan,
+                                           zonemap=True)
+        self._id = next(self._ids)
+
+    @property
+    def shape(self):
+        return self.plan.shape
+
+    @property
+    def part_shape(self):
+        return self.plan.part_shape
+
+    @property
+    def ndim(self):
+        return self.plan.dimension
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    @property
+    def cbytes(self):
+        return cb2.blosc_cbuffer_sizes(self.comp)[1]
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return "CompressedPartitionedArray(shape={}, part_shape={}, dtype={}, cratio={:.2f})".format(
+            self.shape, self.part_shape, self.dtype, self.nbytes / self.cbytes)
+
+    def __array__(self, dtype=None):
+        dest = decompress_full(self.comp, self.plan, self.dtype, nthreads=self.nthreads)
+        return dest if dtype is None else dest.astype(dtype)
+
+    def _decompress(self, key):
+        return decompress_trans(self.comp, self.shape, self.plan.trans_shape, self.part_shape, self.dtype, key,
+                                nthreads=self.nthreads, plan=self.plan, cache=self.cache, dataset=self._id)
+
+    def __getitem__(self, key):
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if not any(_is_array_index(k) for k in key):
+            return self._decompress(key)
+
+        # Integers and index arrays are advanced indices (as in NumPy)
+
+        key = _expand_key(key, self.ndim)
+        index = []
+
+        for i, k in enumerate(key):
+            if isinstance(k, slice):
+                index.append(k)
+                continue
+            k = np.asarray(k, dtype=np.intp)
+            k = np.where(k < 0, k + self.shape[i], k)
+            if np.any((k < 0) | (k >= self.shape[i])):
+                raise IndexError("index is out of bounds for axis {} with size {}".format(i, self.shape[i]))
+            index.append(k)
+
+        # Only points: look up the partitions of each one
+
+        if not any(isinstance(k, slice) for k in index):
+            index = np.broadcast_arrays(*index)
+            coords = np.stack([k.ravel() for k in index], axis=1)
+            dest = take_points(self.comp, self.plan, coords, self.dtype, self.nthreads)
+            return dest.reshape(index[0].shape)
+
+        # Gather the distinct values of the index arrays, decompressing them in groups that share
+        # a partition along each axis, and index the gathered data with NumPy
+
+        shape, groups, local = [], [], []
+
+        for i, k in enumerate(index):
+            if isinstance(k, slice):
+                shape.append(len(range(*k.indices(self.shape[i]))))
+                groups.append([(k, slice(None), slice(None))])
+                local.append(slice(None))
+            else:
+                values, inverse = np.unique(k, return_inverse=True)
+                bounds = np.flatnonzero(np.diff(values // self.part_shape[i])) + 1
+                bounds = [0] + bounds.tolist() + [len(values)] if len(values) else []
+                shape.append(len(values))
+                groups.append([(slice(values[lo], values[hi - 1] + 1), values[lo:hi] - values[lo], slice(lo, hi))
+                               for lo, hi in zip(bounds[:-1], bounds[1:])])
+                local.append(inverse.reshape(k.shape))
+
+        dest = np.empty(shape, dtype=self.dtype)
+
+        for group in itertools.product(*groups):
+            block = self._decompress(tuple(box for box, _, _ in group))
+            for i, (_, src_index, _) in enumerate(group):
+                if not isinstance(src_index, slice):
+                    block = block.take(src_index, axis=i)
+            dest[tuple(dest_sl for _, _, dest_sl in group)] = block
+
+        return dest[tuple(local)]
+
+    # Reductions (computed one batch of partitions at a time)
+
+    def _reduce(self, ufunc, axis, dtype, initial, nthreads):
+
+        if axis is None:
+            axes = tuple(range(self.ndim))
+        else:
+            axes = tuple(sorted(a % self.ndim for a in np.atleast_1d(axis)))
+
+        out = np.full([1 if i in axes else n for i, n in enumerate(self.shape)], initial, dtype=dtype)
+
+        nthreads = self.nthreads if nthreads is None else nthreads
+        batch = max(nthreads, REDUCE_BATCH_NBYTES // self.plan.part_nbytes)
+
+        for p0 in range(0, self.plan.npart, batch):
+            parts = np.arange(p0, min(p0 + batch, self.plan.npart))
+            buf = _decompress_parts(self.comp, self.plan, parts, self.dtype, nthreads)
+
+            for part, pc in zip(buf, zip(*np.unravel_index(parts, self.plan.nparts))):
+
+                # Crop the padding and reduce the partition into its cells of the result
+
+                lo = [c * p for c, p in zip(pc, self.part_shape)]
+                ext = [min(p, n - l) for p, n, l in zip(self.part_shape, self.shape, lo)]
+
+                block = part.reshape(self.part_shape)[tuple(slice(0, e) for e in ext)]
+                res = ufunc.reduce(block, axis=axes, dtype=dtype, keepdims=True)
+
+                sl = tuple(slice(0, 1) if i in axes else slice(lo[i], lo[i] + ext[i]) for i in range(self.ndim))
+                ufunc(out[sl], res, out=out[sl])
+
+        out = out.reshape([n for i, n in enumerate(out.shape) if i not in axes])
+
+        return out[()] if out.ndim == 0 else out
+
+    def sum(self, axis=None, nthreads=None):
+        """
+        Sum of the elements along the given axes (all of them by default).
+
+        Only one batch of partitions is decompressed at a time, so the memory used is proportional
+        to the result. The partitions of a batch are decompressed by nthreads threads.
+        """
+
+        dtype = np.add.reduce(np.zeros(1, dtype=self.dtype)).dtype
+
+        return self._reduce(np.add, axis, dtype, 0, nthreads)
+
+    def mean(self, axis=None, nthreads=None):
+        """
+        Mean of the elements along the given axes (all of them by default).
+        """
+
+        dtype = np.float64 if self.dtype.kind in 'iub' else self.dtype
+
+        return self._reduce(np.add, axis, dtype, 0, nthreads) / self.count(axis)
+
+    def min(self, axis=None, nthreads=None):
+        """
+        Minimum of the elements along the given axes (all of them by default).
+        """
+
+        initial = np.iinfo(self.dtype).max if self.dtype.kind in 'iu' else np.inf
+
+        return self._reduce(np.minimum, axis, self.dtype, initial, nthreads)
+
+    def max(self, axis=None, nthreads=None):
+        """
+        Maximum of the elements along the given axes (all of them by default).
+        """
+
+        initial = np.iinfo(self.dtype).min if self.dtype.kind in 'iu' else -np.inf
+
+        return self._reduce(np.maximum, axis, self.dtype, initial, nthreads)
+
+    def count(self, axis=None):
+        """
+        Number of elements reduced along the given axes (all of them by default).
+        """
+
+        if axis is None:
+            return self.size
+
+        return int(np.prod([self.shape[a] for a in np.atleast_1d(axis)]))
+
+    def where(self, op, value, nthreads=None):
+        """
+        Coordinates of the elements that satisfy "element op value" (see the where function).
+        """
+
+        nthreads = self.nthreads if nthreads is None else nthreads
+
+        return where(self.comp, self.plan, self.zonemap, op, value, self.dtype, nthreads)
+
+    def save(self, path):
+        """
+        Write the compressed data in a file (see write_file).
+        """
+
+        write_file(path, self.comp, self.plan, self.dtype)
+
+
+# Container files
+#
+# A file starts with a preamble (magic, offset and size of the last table segment) followed by
+# Blosc chunks whose blocks are partitions, and table segments. A segment is a header (JSON with
+# the shape, partition shape, dtype, codec parameters, number of entries and position of the
+# previous segment) followed by the entries (partition, chunk offset, chunk size and block) of
+# the partitions written since the previous segment. Updates only append chunks and a segment,
+# and the table of partitions is built applying the segments from the first one. compact
+# rewrites a file without the chunks that are not used anymore and with a single segment.
+
+
+def _write_segment(f, plan, dtype, codec, clevel, filters, parts, offset, nbytes, block):
+    """
+    Append a table segment at the end of a container file and point the preamble to it.
+    """
+
+    f.seek(0)
+    magic, prev, prev_nbytes = FILE_PREAMBLE.unpack(f.read(FILE_PREAMBLE.size))
+
+    entries = np.empty(len(parts), dtype=FILE_ENTRY_DTYPE)
+    entries['part'] = parts
+    entries['offset'] = offset
+    entries['nbytes'] = nbytes
+    entries['block'] = block
+
+    header = json.dumps({
+        'shape': list(plan.shape),
+        'trans_shape': list(plan.trans_shape),
+        'part_shape': list(plan.part_shape),
+        'dtype': np.dtype(dtype).str,
+        'codec': codec,
+        'clevel': clevel,
+        'filters': list(filters),
+        'nentries': len(entries),
+        'prev': [prev, prev_nbytes] if prev else None,
+    }).encode()
+
+    f.seek(0, 2)
+    offset = f.tell()
+    f.write(header)
+    f.write(entries.tobytes())
+    f.flush()
+
+    # The preamble is written last, so the previous segment is valid until the new one is complete
+
+    f.seek(0)
+    f.write(FILE_PREAMBLE.pack(FILE_MAGIC, offset, len(header)))
+    f.flush()
+
+
+def _read_header(f, path):
+    """
+    Read the header of a container file and build its table of partitions.
+
+    Returns
+    -------
+    header: dict
+        Header of the last table segment (with the data type as np.dtype).
+    plan: TransformPlan
+        Plan of the data.
+    offset: int
+        Position of the last table segment in the file.
+    table: np.array
+        Chunk offset, chunk size and block of each partition.
+    """
+
+    f.seek(0)
+    preamble = f.read(FILE_PREAMBLE.size)
+
+    if len(preamble) != FILE_PREAMBLE.size or preamble[:len(FILE_MAGIC)] != FILE_MAGIC:
+        raise ValueError("{} is not a tData file".format(path))
+
+    magic, offset, nbytes = FILE_PREAMBLE.unpack(preamble)
+
+    header = None
+    segments = []
+    position = [offset, nbytes]
+
+    while position is not None:
+        f.seek(position[0])
+        segment = json.loads(f.read(position[1]).decode())
+        entries = np.frombuffer(f.read(segment['nentries'] * FILE_ENTRY_DTYPE.itemsize),
+                                dtype=FILE_ENTRY_DTYPE)
+
+        if len(entries) != segment['nentries']:
+            raise ValueError("{} is truncated".format(path))
+
+        header = segment if header is None else header
+        segments.append(entries)
+        position = segment['prev']
+
+    header['dtype'] = np.dtype(header['dtype'])
+
+    plan = get_plan(header['shape'], header['part_shape'], header['dtype'])
+
+    # The oldest segments are applied first, so the newest entry of each partition wins
+
+    table = np.empty(plan.npart, dtype=FILE_TABLE_DTYPE)
+    table['offset'] = -1
+
+    for entries in reversed(segments):
+        table['offset'][entries['part']] = entries['offset']
+        table['nbytes'][entries['part']] = entries['nbytes']
+        table['block'][entries['part']] = entries['block']
+
+    # The C functions trust the table and the chunk headers, so the entries outside the file or
+    # that do not match their chunk are rejected here
+
+    f.seek(0, 2)
+    size = f.tell()
+
+    if ((table['offset'] < FILE_PREAMBLE.size) | (table['nbytes'] < BLOSC_MIN_HEADER_LENGTH)
+            | (table['offset'] + table['nbytes'] > size) | (table['block'] < 0)).any():
+        raise ValueError("{} is truncated".format(path))
+
+    chunks, index = np.unique(table['offset'], return_inverse=True)
+    sizes = np.empty((len(chunks), 2), dtype=np.int64)
+
+    for i, chunk in enumerate(chunks):
+        f.seek(chunk)
+        nbytes, cbytes, blocksize = cb2.blosc_cbuffer_sizes(f.read(BLOSC_MIN_HEADER_LENGTH))
+
+        if blocksize != plan.part_nbytes or nbytes % plan.part_nbytes:
+            raise ValueError("{} is truncated".format(path))
+
+        sizes[i] = cbytes, nbytes // plan.part_nbytes
+
+    sizes = sizes[index.reshape(-1)]
+
+    if ((table['nbytes'] != sizes[:, 0]) | (table['block'] >= sizes[:, 1])).any():
+        raise ValueError("{} is truncated".format(path))
+
+    return header, plan, offset, table
+
+
+def write_file(path, comp, plan, dtype, codec='blosclz', clevel=9, filters=(BLOSC_SHUFFLE,)):
+    """
+    Write compressed data in a container file (in a single chunk, see compress_file for data
+    larger than a Blosc chunk).
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    comp : chunk
+        Data compressed (output of compress).
+    plan: TransformPlan
+        Plan of the original data.
+    dtype: np.dtype
+        Data type.
+    codec, clevel, filters: optional
+        Compression parameters used by compress (they are stored in the header).
+    """
+
+    if cb2.blosc_cbuffer_sizes(comp)[0] != plan.npart * plan.part_nbytes:
+        raise ValueError("the compressed data does not match {!r}".format(plan))
+
+    comp = memoryview(comp).cast('B')
+
+    with open(path, 'w+b') as f:
+        f.write(FILE_PREAMBLE.pack(FILE_MAGIC, 0, 0))
+        f.write(comp)
+        _write_segment(f, plan, dtype, codec, clevel, filters, np.arange(plan.npart), FILE_PREAMBLE.size,
+                       comp.nbytes, np.arange(plan.npart))
+
+
+def compress_file(path, src, ps, codec='blosclz', clevel=9, filters=(BLOSC_SHUFFLE,), nthreads=1):
+    """
+    Transform, compress and write data in a container file, one row of partitions (along the
+    first axis) at a time.
+
+    Each row of partitions is written as its own chunk, so the size of the data is not limited by
+    the size of a Blosc chunk (about 2 GB) and only one row is kept in memory.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    src : np.array
+        Data to compress (any object with shape and dtype whose slices along the first axis are
+        arrays, like an HDF5 dataset).
+    ps: int[] or tuple
+        Data partition shape.
+    codec, clevel, filters: optional
+        Compression parameters (see compress).
+    nthreads: int, optional
+        Number of threads used to transform and compress the data.
+    """
+
+    dtype = np.dtype(src.dtype)
+    plan = get_plan(src.shape, ps, dtype)
+    row = plan.part_strides[0]
+
+    offsets = np.empty(plan.npart, dtype=np.int64)
+    nbytes = np.empty(plan.npart, dtype=np.int64)
+
+    with open(path, 'w+b') as f:
+        f.write(FILE_PREAMBLE.pack(FILE_MAGIC, 0, 0))
+
+        for n in range(plan.nparts[0] if plan.npart else 0):
+            data = np.asarray(src[n * plan.part_shape[0]:(n + 1) * plan.part_shape[0]], dtype=dtype)
+            row_plan = get_plan(data.shape, ps, dtype)
+
+            comp = compress(tData(data, ps, nthreads=nthreads, plan=row_plan), ps, plan=row_plan, codec=codec,
+                            clevel=clevel, filters=filters, nthreads=nthreads)
+
+            offsets[n * row:(n + 1) * row] = f.tell()
+            nbytes[n * row:(n + 1) * row] = comp.nbytes
+            f.write(memoryview(comp).cast('B'))
+
+        _write_segment(f, plan, dtype, codec, clevel, filters, np.arange(plan.npart), offsets, nbytes,
+                       np.arange(plan.npart) % max(row, 1))
+
+
+def write_region(path, key, values, nthreads=1):
+    """
+    Overwrite a subset of the data in a container file.
+
+    Only the partitions that intersect the subset are decompressed, updated and compressed again
+    (in a new chunk at the end of the file, followed by a table segment with their entries). The
+    other partitions are not modified, and the replaced chunks are dropped by compact.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    key: tuple
+        Defines the subset of data (integers, slices and an ellipsis, as in NumPy).
+    values: np.array or scalar
+        New values (broadcast to the shape of the subset).
+    nthreads: int, optional
+        Number of threads used to decompress and compress the partitions.
+    """
+
+    with PartitionFile(path, nthreads) as f:
+        plan, dtype = f.plan, f.dtype
+
+        start, stop, step, drop, flip = _parse_key(key if isinstance(key, tuple) else (key,), plan.shape)
+
+        fs = [len(range(start[i], stop[i], step[i])) for i in range(plan.dimension)]
+
+        # Values with the axes indexed with an integer and the reversed ones restored
+
+        values = np.broadcast_to(np.asarray(values, dtype=dtype), [fs[i] for i in range(plan.dimension)
+                                                                   if i not in drop]).reshape(fs)
+        values = values[tuple(slice(None, None, -1) if i in flip else slice(None) for i in range(plan.dimension))]
+
+        touched = list(_touched_intersections(plan, start, stop, step)) if values.size > 0 else []
+
+        if not touched:
+            return
+
+        parts = np.array([n for n, _, _ in touched], dtype=np.int64)
+        buf = f.read_parts(parts)
+
+        codec, clevel, filters = f.codec, f.clevel, f.filters
+
+    for part, (n, src_sl, dest_sl) in zip(buf, touched):
+        part.reshape(plan.part_shape)[src_sl] = values[dest_sl]
+
+    comp = compress(buf, plan.part_shape, plan=plan, codec=codec, clevel=clevel, filters=filters,
+                    nthreads=nthreads)
+
+    with open(path, 'r+b') as f:
+
+        # The chunk goes after the last segment, which is valid until the new one is written
+
+        f.seek(0, 2)
+        offset = f.tell()
+        f.write(memoryview(comp).cast('B'))
+
+        _write_segment(f, plan, dtype, codec, clevel, filters, parts, offset, comp.nbytes, np.arange(len(parts)))
+
+
+def compact(path):
+    """
+    Rewrite a container file without the chunks that are not used anymore.
+
+    Updates (PartitionAppender and write_region) append chunks and table segments, so the
+    replaced chunks and the old segments stay in the file until it is compacted. The chunks are
+    copied as they are (without recompressing them) and the table is written in a single segment.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    """
+
+    tmp = path + '.compact'
+
+    with open(path, 'rb') as f:
+        header, plan, offset, table = _read_header(f, path)
+
+        chunks, first, index = np.unique(table['offset'], return_index=True, return_inverse=True)
+        new_offsets = np.empty(len(chunks), dtype=np.int64)
+
+        with open(tmp, 'w+b') as g:
+            g.write(FILE_PREAMBLE.pack(FILE_MAGIC, 0, 0))
+
+            for i, chunk in enumerate(chunks):
+                new_offsets[i] = g.tell()
+                nbytes = int(table['nbytes'][first[i]])
+
+                f.seek(chunk)
+                while nbytes > 0:
+                    data = f.read(min(nbytes, FILE_COPY_NBYTES))
+                    if not data:
+                        raise ValueError("{} is truncated".format(path))
+                    g.write(data)
+                    nbytes -= len(data)
+
+            _write_segment(g, plan, header['dtype'], header['codec'], header['clevel'], header['filters'],
+                           np.arange(plan.npart), new_offsets[index], table['nbytes'], table['block'])
+
+    os.replace(tmp, path)
+
+
+class PartitionFile:
+    """
+    Container file of compressed partitioned data.
+
+    The file is mapped in memory and the partitions are decompressed straight from the mapped
+    pages, so only the pages of the touched partitions are read (through the page cache).
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    nthreads: int, optional
+        Number of threads used to decompress the data.
+    cache: PartitionCache, optional
+        Cache of decompressed partitions shared by the indexing calls.
+
+    Attributes
+    ----------
+    shape, dtype, ndim: as in NumPy
+    plan: TransformPlan
+        Plan of the data.
+    codec, clevel, filters:
+        Compression parameters of the data.
+    table: np.array
+        Chunk offset, chunk size and block of each partition.
+    """
+
+    def __init__(self, path, nthreads=1, cache=None):
+        self.path = path
+        self.nthreads = nthreads
+        self.cache = cache
+        self._file = open(path, 'rb')
+        self._map = None
+
+        try:
+            self._read_header()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_header(self):
+        header, self.plan, offset, self.table = _read_header(self._file, self.path)
+
+        self.dtype = header['dtype']
+        self.codec = header['codec']
+        self.clevel = header['clevel']
+        self.filters = tuple(header['filters'])
+
+        self._table = (np.ascontiguousarray(self.table['offset']), np.ascontiguousarray(self.table['block']))
+        self._id = (self.path, offset)
+
+    @property
+    def shape(self):
+        return self.plan.shape
+
+    @property
+    def ndim(self):
+        return self.plan.dimension
+
+    def __repr__(self):
+        return "PartitionFile({!r}, shape={}, part_shape={}, dtype={})".format(
+            self.path, self.plan.shape, self.plan.part_shape, self.dtype)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_parts(self, parts, nthreads=None):
+        """
+        Decompress a list of partitions in an array with one row per partition.
+        """
+
+        nthreads = self.nthreads if nthreads is None else nthreads
+
+        return _decompress_parts(self._map, self.plan, parts, self.dtype, nthreads, self._table)
+
+    def __getitem__(self, key):
+        """
+        Decompress a subset of the data (integers, slices and an ellipsis, as in NumPy).
+        """
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        return decompress_trans(self._map, self.shape, self.plan.trans_shape, self.plan.part_shape, self.dtype,
+                                key, self.nthreads, self.plan, self.cache, self._id, self._table)
+
+    def __array__(self, dtype=None):
+        dest = decompress_full(self._map, self.plan, self.dtype, nthreads=self.nthreads, table=self._table)
+        return dest if dtype is None else dest.astype(dtype)
+
+
+class PartitionAppender:
+    """
+    Append data along the first axis of a container file.
+
+    The appended slabs are buffered until a full row of partitions along the first axis is
+    available. Then only the new partitions are transformed and compressed, and written as a new
+    chunk at the end of the file followed by a table segment with their entries. The existing
+    chunks are never recompressed (see compact to drop the replaced ones).
+
+    The rows of an incomplete row of partitions (already in the file or appended) stay in the
+    buffer. flush writes them as a padded row of partitions, which is written again when it is
+    completed.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    nthreads: int, optional
+        Number of threads used to transform and compress the data.
+
+    Attributes
+    ----------
+    shape, dtype: as in NumPy
+        Shape of the data in the file (including the appended rows not flushed yet).
+    plan: TransformPlan
+        Plan of the data in the file.
+    """
+
+    def __init__(self, path, nthreads=1):
+        self.path = path
+        self.nthreads = nthreads
+        self._file = open(path, 'r+b')
+
+        try:
+            header, self.plan, offset, table = _read_header(self._file, path)
+        except Exception:
+            self._file.close()
+            raise
+
+        self.dtype = header['dtype']
+        self.codec = header['codec']
+        self.clevel = header['clevel']
+        self.filters = tuple(header['filters'])
+        self.table = table.copy()
+
+        # Rows of the last (incomplete) row of partitions
+
+        self._base = self.plan.shape[0] // self.plan.part_shape[0] * self.plan.part_shape[0]
+        self._buffer = []
+        self._dirty = False
+
+        if self._base < self.plan.shape[0]:
+            with PartitionFile(path, nthreads) as f:
+                self._buffer.append(f[self._base:])
+
+    @property
+    def shape(self):
+        return (self._base + sum(len(b) for b in self._buffer),) + self.plan.shape[1:]
+
+    def __repr__(self):
+        return "PartitionAppender({!r}, shape={}, part_shape={}, dtype={})".format(
+            self.path, self.shape, self.plan.part_shape, self.dtype)
+
+    def append(self, slab):
+        """
+        Append a slab of data along the first axis (the other axes must match the data in the
+        file). A slab without the first axis is appended as a single row.
+        """
+
+        slab = np.asarray(slab)
+
+        if slab.dtype != self.dtype:
+            raise ValueError("slab dtype {} does not match {}".format(slab.dtype, self.dtype))
+
+        if slab.shape == self.plan.shape[1:]:
+            slab = slab[np.newaxis]
+
+        if slab.shape[1:] != self.plan.shape[1:]:
+            raise ValueError("slab shape {} does not match {}".format(slab.shape, self.plan.shape))
+
+        if len(slab) == 0:
+            return
+
+        self._buffer.append(np.array(slab))
+        self._dirty = True
+
+        # Write the full rows of partitions
+
+        ps0 = self.plan.part_shape[0]
+        rows = sum(len(b) for b in self._buffer)
+
+        if rows >= ps0:
+            data = np.concatenate(self._buffer)
+            full = rows // ps0 * ps0
+
+            self._write_rows(data[:full])
+
+            self._base += full
+            self._buffer = [data[full:]] if full < rows else []
+            self._dirty = full < rows
+
+    def flush(self):
+        """
+        Write the rows of the incomplete row of partitions, padding it.
+        """
+
+        if self._dirty:
+            data = np.concatenate(self._buffer)
+            self._buffer = [data]
+            self._write_rows(data)
+            self._dirty = False
+
+    def _write_rows(self, data):
+        """
+        Compress rows of data that start at the first row of a row of partitions.
+        """
+
+        ps = self.plan.part_shape
+        plan = get_plan(data.shape, ps, self.dtype)
+
+        comp = compress(tData(data, ps, nthreads=self.nthreads, plan=plan), ps, plan=plan, codec=self.codec,
+                        clevel=self.clevel, filters=self.filters, nthreads=self.nthreads)
+
+        # The chunk goes after the last segment, which is valid until the new one is written
+
+        self._file.seek(0, 2)
+        offset = self._file.tell()
+        self._file.write(memoryview(comp).cast('B'))
+
+        entries = np.empty(plan.npart, dtype=FILE_TABLE_DTYPE)
+        entries['offset'] = offset
+        entries['nbytes'] = comp.nbytes
+        entries['block'] = np.arange(plan.npart)
+
+        # Appending rows along the first axis does not change the numbers of the previous partitions
+
+        first = self._base // ps[0] * self.plan.part_strides[0]
+
+        self.table = np.concatenate([self.table[:first], entries])
+        self.plan = get_plan((max(self.plan.shape[0], self._base + len(data)),) + self.plan.shape[1:], ps,
+                             self.dtype)
+
+        _write_segment(self._file, self.plan, self.dtype, self.codec, self.clevel, self.filters,
+                       first + np.arange(plan.npart), offset, comp.nbytes, entries['block'])
+
+    def close(self):
+        """
+        Flush the buffered rows and close the file.
+        """
+
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()